@@ -17,7 +17,8 @@ export async function GET(request: NextRequest) {
     const status = searchParams.get('status');
     const limit = parseInt(searchParams.get('limit') || '50');
 
-    const where: any = {};
+    // Uncommitted preview sessions (status 'preview') are not uploads yet
+    const where: any = { AND: [{ status: { not: 'preview' } }] };
     if (modelId) where.modelId = parseInt(modelId);
     if (status) where.status = status;
 
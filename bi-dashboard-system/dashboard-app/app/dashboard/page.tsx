@@ -25,7 +25,7 @@ export default async function DashboardPage() {
   const [userCount, dataModelCount, uploadCount, recentActivity] = await Promise.all([
     prisma.user.count(),
     prisma.dataModel.count({ where: { isActive: 1 } }),
-    prisma.uploadHistory.count(),
+    prisma.uploadHistory.count({ where: { status: { not: 'preview' } } }),
     prisma.auditLog.findMany({
       take: 5,
       orderBy: { createdAt: 'desc' },
@@ -28,6 +28,8 @@ export default async function UploadsPage() {
   // Fetch uploads and data models
   const [uploads, dataModels] = await Promise.all([
     prisma.uploadHistory.findMany({
+      // Uncommitted preview sessions are not uploads yet
+      where: { status: { not: 'preview' } },
       include: {
         user: true,
         dataModel: true,
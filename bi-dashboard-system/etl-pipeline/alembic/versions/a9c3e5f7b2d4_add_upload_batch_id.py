@@ -0,0 +1,45 @@
+"""add upload batch id
+
+Revision ID: a9c3e5f7b2d4
+Revises: f2b8d4a6c1e3
+Create Date: 2026-10-17 18:47:31.205816
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e5f7b2d4'
+down_revision: Union[str, None] = 'f2b8d4a6c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('upload_history', sa.Column('batch_id', sa.String(length=36), nullable=True))
+    op.create_index(op.f('ix_upload_history_batch_id'), 'upload_history', ['batch_id'], unique=False)
+    
+    # Backfill from the metadata JSON, where the batch id was kept until now
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, metadata FROM upload_history WHERE metadata LIKE '%batch_id%'"
+    )).fetchall()
+    for row_id, metadata in rows:
+        try:
+            batch_id = json.loads(metadata).get("batch_id")
+        except (ValueError, AttributeError):
+            continue
+        if batch_id:
+            bind.execute(
+                sa.text("UPDATE upload_history SET batch_id = :batch_id WHERE id = :id"),
+                {"batch_id": batch_id, "id": row_id}
+            )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upload_history_batch_id'), table_name='upload_history')
+    op.drop_column('upload_history', 'batch_id')
@@ -0,0 +1,26 @@
+"""add data model ingest config
+
+Revision ID: c4e8a1f2b7d3
+Revises: 7a92759c5490
+Create Date: 2026-10-17 09:12:40.518227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f2b7d3'
+down_revision: Union[str, None] = '7a92759c5490'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('data_models', sa.Column('ingest_config', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('data_models', 'ingest_config')
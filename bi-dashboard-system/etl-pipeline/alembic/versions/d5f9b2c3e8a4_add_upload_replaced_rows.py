@@ -0,0 +1,39 @@
+"""add upload replaced rows
+
+Revision ID: d5f9b2c3e8a4
+Revises: c4e8a1f2b7d3
+Create Date: 2026-10-17 13:40:12.284915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f9b2c3e8a4'
+down_revision: Union[str, None] = 'c4e8a1f2b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_replaced_rows',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('upload_id', sa.Integer(), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['upload_id'], ['upload_history.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_replaced_rows_id'), 'upload_replaced_rows', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_replaced_rows_upload_id'), 'upload_replaced_rows', ['upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upload_replaced_rows_upload_id'), table_name='upload_replaced_rows')
+    op.drop_index(op.f('ix_upload_replaced_rows_id'), table_name='upload_replaced_rows')
+    op.drop_table('upload_replaced_rows')
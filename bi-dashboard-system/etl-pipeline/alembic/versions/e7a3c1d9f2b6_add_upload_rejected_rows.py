@@ -0,0 +1,40 @@
+"""add upload rejected rows
+
+Revision ID: e7a3c1d9f2b6
+Revises: d5f9b2c3e8a4
+Create Date: 2026-10-17 16:05:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c1d9f2b6'
+down_revision: Union[str, None] = 'd5f9b2c3e8a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_rejected_rows',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('upload_id', sa.Integer(), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('errors', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['upload_id'], ['upload_history.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_rejected_rows_id'), 'upload_rejected_rows', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_rejected_rows_upload_id'), 'upload_rejected_rows', ['upload_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upload_rejected_rows_upload_id'), table_name='upload_rejected_rows')
+    op.drop_index(op.f('ix_upload_rejected_rows_id'), table_name='upload_rejected_rows')
+    op.drop_table('upload_rejected_rows')
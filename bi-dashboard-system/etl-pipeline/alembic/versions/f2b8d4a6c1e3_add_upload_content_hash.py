@@ -0,0 +1,45 @@
+"""add upload content hash
+
+Revision ID: f2b8d4a6c1e3
+Revises: e7a3c1d9f2b6
+Create Date: 2026-10-17 18:22:09.614027
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c1e3'
+down_revision: Union[str, None] = 'e7a3c1d9f2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('upload_history', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_upload_history_content_hash'), 'upload_history', ['content_hash'], unique=False)
+    
+    # Backfill from the metadata JSON, where the hash was kept until now
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, metadata FROM upload_history WHERE metadata LIKE '%content_hash%'"
+    )).fetchall()
+    for row_id, metadata in rows:
+        try:
+            content_hash = json.loads(metadata).get("content_hash")
+        except (ValueError, AttributeError):
+            continue
+        if content_hash:
+            bind.execute(
+                sa.text("UPDATE upload_history SET content_hash = :content_hash WHERE id = :id"),
+                {"content_hash": content_hash, "id": row_id}
+            )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upload_history_content_hash'), table_name='upload_history')
+    op.drop_column('upload_history', 'content_hash')
@@ -4,13 +4,15 @@ etl-pipeline/app/api/data_models.py
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from ..database import get_db
 from ..schemas.data_model import (
     DataModelCreate,
     DataModelUpdate,
     DataModelResponse,
+    RetentionRequest,
+    RetentionResponse,
     DataRelationshipCreate,
     DataRelationshipResponse
 )
@@ -82,18 +84,39 @@ def delete_data_model(
     return None
 
 
+@router.post("/{model_id}/retention", response_model=RetentionResponse)
+def apply_retention(
+    model_id: int,
+    retention: RetentionRequest,
+    current_user = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Remove data older than a cutoff from a partitioned data model (Admin only)
+    """
+    return DataModelService.apply_retention(db, model_id, retention.before, current_user.id)
+
+
 @router.get("/{model_id}/data", response_model=Dict[str, Any])
 def get_model_data(
     model_id: int,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,  # next_cursor of the previous page
+    order_by: Optional[str] = None,  # Indexed column (default: id)
+    direction: Optional[str] = None,  # asc or desc
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Get data from data model table
+    
+    Follow next_cursor for further pages; unlike offset, it costs the same
+    however deep the page.
     """
-    return DataModelService.get_model_data(db, model_id, limit, offset)
+    return DataModelService.get_model_data(
+        db, model_id, limit, offset, cursor, order_by, direction
+    )
 
 
 @router.post("/relationships", response_model=DataRelationshipResponse, status_code=status.HTTP_201_CREATED)
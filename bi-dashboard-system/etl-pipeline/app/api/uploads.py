@@ -2,53 +2,72 @@
 Upload API Routes
 etl-pipeline/app/api/uploads.py
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
 
 from ..database import get_db
-from ..schemas.upload import UploadResponse, UploadPreview
+from ..schemas.upload import (
+    UploadResponse,
+    UploadPreview,
+    BatchUploadResponse,
+    UploadStatsResponse,
+    RejectedRowsResponse,
+    DryRunResponse
+)
 from ..services.upload_service import UploadService
-from ..utils.file_handler import save_upload_file, read_file_preview
 from .dependencies import get_current_active_user
 
 router = APIRouter()
 
 
 @router.post("/preview", response_model=UploadPreview)
-async def preview_file(
+def preview_file(
     file: UploadFile = File(...),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Preview uploaded file before processing
-    """
-    # Save file temporarily
-    file_path = save_upload_file(file)
-    
-    # Get preview
-    preview_data = read_file_preview(file_path, rows=10)
     
-    if not preview_data.get('success'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=preview_data.get('error', 'Failed to preview file')
-        )
+    The file is kept as an upload session; pass the returned upload_token
+    to POST /uploads/ to import it without sending it again.
+    """
+    preview_data = UploadService.create_upload_session(
+        db=db,
+        file=file,
+        user_id=current_user.id,
+        rows=10
+    )
     
     return UploadPreview(**preview_data)
 
 
-@router.post("/", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload_file(
-    file: UploadFile = File(...),
+@router.post(
+    "/",
+    response_model=Union[UploadResponse, DryRunResponse],
+    status_code=status.HTTP_202_ACCEPTED
+)
+def upload_file(
+    response: Response,
+    file: Optional[UploadFile] = File(None),
     model_id: int = Form(...),
     column_mapping: Optional[str] = Form(None),  # JSON string
+    upload_token: Optional[str] = Form(None),  # From POST /uploads/preview
+    mode: Optional[str] = Form(None),  # append, merge or delta (default: the model's ingest_config)
+    dry_run: bool = Form(False),  # Only validate, importing nothing
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    Upload and process file
+    Upload file and queue it for processing
+    
+    Returns immediately with a pending upload; poll GET /uploads/{upload_id}
+    for progress. Send either the file or the upload_token of a preview.
+    
+    With dry_run, the file is validated on all CPU cores and the full
+    validation statistics are returned (200) instead; nothing is imported
+    and a preview session stays available for a real upload.
     """
     import json
     
@@ -62,17 +81,110 @@ async def upload_file(
                 detail="Invalid column mapping JSON"
             )
     
+    if file is None and not upload_token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either a file or an upload_token is required"
+        )
+    
+    if dry_run:
+        response.status_code = status.HTTP_200_OK
+        return UploadService.dry_run_upload(
+            db=db,
+            model_id=model_id,
+            user_id=current_user.id,
+            file=file,
+            upload_token=upload_token,
+            column_mapping=mapping
+        )
+    
+    if upload_token:
+        return UploadService.commit_upload_session(
+            db=db,
+            upload_token=upload_token,
+            model_id=model_id,
+            user_id=current_user.id,
+            column_mapping=mapping,
+            mode=mode
+        )
+    
     upload = UploadService.upload_file(
         db=db,
         file=file,
         model_id=model_id,
         user_id=current_user.id,
-        column_mapping=mapping
+        column_mapping=mapping,
+        mode=mode
     )
     
     return upload
 
 
+@router.post("/batch", response_model=BatchUploadResponse, status_code=status.HTTP_202_ACCEPTED)
+def upload_batch(
+    files: List[UploadFile] = File(...),
+    model_mapping: Optional[str] = Form(None),  # JSON: {"file name": model_id}
+    model_id: Optional[int] = Form(None),  # For files not in model_mapping
+    column_mappings: Optional[str] = Form(None),  # JSON: {"file name": {column mapping}}
+    mode: Optional[str] = Form(None),  # append, merge or delta, for every file
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload many files, or zip archives of files, and queue them together
+    
+    Files of the same data model are processed in the order sent; poll
+    GET /uploads/batch/{batch_id} for the combined progress.
+    """
+    import json
+    
+    try:
+        mapping = json.loads(model_mapping) if model_mapping else {}
+        mappings = json.loads(column_mappings) if column_mappings else {}
+    except json.JSONDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid model or column mapping JSON"
+        )
+    
+    return UploadService.upload_batch(
+        db=db,
+        files=files,
+        user_id=current_user.id,
+        model_mapping={name: int(value) for name, value in mapping.items()},
+        default_model_id=model_id,
+        column_mappings=mappings,
+        mode=mode
+    )
+
+
+@router.get("/batch/{batch_id}", response_model=BatchUploadResponse)
+def get_upload_batch(
+    batch_id: str,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the combined status of a batch upload
+    """
+    return UploadService.get_batch_summary(db, batch_id)
+
+
+@router.get("/stats", response_model=UploadStatsResponse)
+def get_upload_stats(
+    model_id: int,
+    limit: int = 100,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get per-stage timing and throughput aggregated over a data model's recent uploads
+    
+    Per-upload numbers are in metadata_json["stages"] of GET /uploads/{upload_id}.
+    """
+    return UploadService.get_model_upload_stats(db, model_id, limit)
+
+
 @router.get("/", response_model=List[UploadResponse])
 def get_upload_history(
     model_id: Optional[int] = None,
@@ -92,7 +204,7 @@ def get_upload_history(
     return uploads
 
 
-@router.post("/{upload_id}/rollback", response_model=UploadResponse)
+@router.post("/{upload_id}/rollback", response_model=UploadResponse, status_code=status.HTTP_202_ACCEPTED)
 def rollback_upload(
     upload_id: int,
     current_user = Depends(get_current_active_user),
@@ -100,11 +212,40 @@ def rollback_upload(
 ):
     """
     Rollback an upload
+    
+    Rows are removed in the background; the upload is "reverting" until done.
     """
     upload = UploadService.rollback_upload(db, upload_id, current_user.id)
     return upload
 
 
+@router.post("/{upload_id}/resume", response_model=UploadResponse, status_code=status.HTTP_202_ACCEPTED)
+def resume_upload(
+    upload_id: int,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Resume an interrupted upload from its last checkpoint
+    """
+    upload = UploadService.resume_upload(db, upload_id, current_user.id)
+    return upload
+
+
+@router.get("/{upload_id}/rejected", response_model=RejectedRowsResponse)
+def get_rejected_rows(
+    upload_id: int,
+    limit: int = 100,
+    offset: int = 0,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the rows of an upload that failed validation, with the reasons
+    """
+    return UploadService.get_rejected_rows(db, upload_id, limit, offset)
+
+
 @router.get("/{upload_id}", response_model=UploadResponse)
 def get_upload(
     upload_id: int,
@@ -31,41 +31,71 @@ class Settings(BaseSettings):
     # env values like "http://a,http://b". Use the `cors_origins` property to
     # access the parsed list.
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
-
+    
     @property
     def cors_origins(self) -> List[str]:
         """Return CORS origins as a list.
-
+        
         Supports either a JSON list in the environment (e.g. '["https://a","https://b"]')
         or a comma-separated string (e.g. 'https://a,https://b').
         """
         raw = os.getenv("CORS_ORIGINS", self.CORS_ORIGINS)
         if not raw:
             return []
-
+        
         # Try JSON first
         try:
             import json
-
+            
             parsed = json.loads(raw)
             if isinstance(parsed, (list, tuple)):
                 return [str(x).strip() for x in parsed if str(x).strip()]
         except Exception:
             pass
-
+        
         # Fallback to comma-separated parsing
         return [x.strip() for x in raw.split(",") if x.strip()]
     
     # File Upload
     MAX_UPLOAD_SIZE: int = 52428800  # 50MB
     # Keep as comma-separated string in env; use `allowed_extensions` to get list
-    ALLOWED_EXTENSIONS: str = "xlsx,xls,csv"
+    ALLOWED_EXTENSIONS: str = "xlsx,xls,csv,csv.gz,csv.zst,zip,parquet,arrow,feather"
     
     @property
     def allowed_extensions(self) -> List[str]:
         raw = os.getenv("ALLOWED_EXTENSIONS", self.ALLOWED_EXTENSIONS)
         return [x.strip().lower() for x in raw.split(",") if x.strip()]
     UPLOAD_DIR: str = "./uploads"
+    UPLOAD_CHUNK_SIZE: int = 50000  # Rows read, validated and inserted per chunk
+    MAX_UPLOAD_ROWS: int = 10000000  # Data rows per upload, after decompression
+    DUPLICATE_UPLOAD_POLICY: str = "skip"  # skip, reject, allow
+    UPLOAD_MAX_ERROR_ROWS: int = 1000  # Per-row error reports kept per upload
+    ARCHIVE_MAX_MEMBERS: int = 100  # Files extracted from one zip archive
+    ARCHIVE_MAX_TOTAL_SIZE: int = 524288000  # Bytes extracted from one zip archive (500MB)
+    
+    # Bulk loading
+    BULK_LOAD_STRATEGY: str = "auto"  # auto, load_data_infile, executemany, sqlalchemy
+    MYSQL_LOCAL_INFILE: bool = False  # Requires local_infile=ON on the MySQL server
+    UPLOAD_PARTITIONS: int = 64  # KEY partitions of tables partitioned by upload (MySQL allows 8192)
+    UPLOAD_PARALLEL_CONNECTIONS: int = 1  # >1 spreads insert batches over pooled connections
+    UPLOAD_BATCH_TARGET_BYTES: int = 1048576  # Initial insert batch size in bytes (1MB), divided by the row width
+    UPLOAD_MIN_BATCH_SIZE: int = 100
+    UPLOAD_MAX_BATCH_SIZE: int = 50000
+    UPLOAD_BATCH_TARGET_SECONDS: float = 0.5  # Batch latency the sizer tunes toward
+    
+    # Background ingestion
+    UPLOAD_WORKERS: int = 2  # Worker threads processing uploads
+    UPLOAD_QUEUE_SIZE: int = 20  # Max uploads queued or running at once
+    UPLOAD_STALE_SECONDS: int = 300  # No progress for this long means the worker died
+    UPLOAD_SESSION_TTL_MINUTES: int = 60  # Preview sessions not committed in time are removed
+    ROLLBACK_CHUNK_SIZE: int = 10000  # Rows deleted per statement when rolling back
+    TYPE_INFERENCE_SAMPLE_ROWS: int = 10000  # Reservoir size for preview type detection
+    TYPE_INFERENCE_SCAN_ROWS: int = 20000  # Rows read, spread over the file where possible, to draw the sample from
+    TYPE_INFERENCE_CACHE_SIZE: int = 256  # Files whose inferred types are kept in memory
+    UPLOAD_TRACE_MEMORY: bool = False  # Record tracemalloc peaks per upload stage (slows ingestion)
+    UPLOAD_COMPACT_FRAMES: bool = True  # Narrow column dtypes as each chunk is type-converted
+    COMPACT_CATEGORY_RATIO: float = 0.5  # Strings with at most this share of distinct values become categoricals
+    DRY_RUN_WORKERS: int = 0  # Processes validating dry-run chunks; 0 uses every CPU
     
     # JWT
     JWT_SECRET_KEY: str = "change-this-jwt-secret"
@@ -13,6 +13,11 @@ from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# LOAD DATA LOCAL INFILE must be enabled on the client connection
+connect_args = {}
+if settings.DATABASE_URL.startswith("mysql") and settings.MYSQL_LOCAL_INFILE:
+    connect_args["local_infile"] = True
+
 # Create database engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
@@ -22,6 +27,7 @@ engine = create_engine(
     pool_pre_ping=True,  # Verify connections before using
     pool_recycle=3600,   # Recycle connections after 1 hour
     echo=settings.DEBUG,
+    connect_args=connect_args,
 )
 
 # Create SessionLocal class
@@ -39,6 +45,9 @@ Base = declarative_base()
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     """Set connection parameters on connect"""
+    if engine.dialect.name != "mysql":
+        return
+    
     cursor = dbapi_conn.cursor()
     cursor.execute("SET SESSION sql_mode='STRICT_TRANS_TABLES,NO_ENGINE_SUBSTITUTION'")
     cursor.close()
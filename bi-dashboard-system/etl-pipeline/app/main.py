@@ -9,8 +9,11 @@ import logging
 import time
 
 from .config import settings
-from .database import check_db_connection, init_db
+from .database import check_db_connection, init_db, SessionLocal
 from .api import api_router
+from .services.upload_queue import shutdown_upload_workers
+from .utils.parallel_validation import shutdown_validation_workers
+from .services.upload_service import UploadService
 
 # Configure logging
 logging.basicConfig(
@@ -90,6 +93,13 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
+    
+    # Remove upload sessions that expired while the service was down
+    db = SessionLocal()
+    try:
+        UploadService.cleanup_expired_sessions(db)
+    finally:
+        db.close()
 
 
 # Shutdown event
@@ -97,6 +107,8 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    shutdown_upload_workers()
+    shutdown_validation_workers()
 
 
 # Health check endpoint
@@ -7,7 +7,7 @@ from .role import Role, Permission, RolePermission, UserRole
 from .organization import OrganizationalUnit, UserOrganizationalUnit
 from .dashboard import Dashboard, DashboardTab, Visualization, DashboardPermission
 from .data_model import DataModel, DataRelationship
-from .upload import UploadHistory
+from .upload import UploadHistory, UploadReplacedRow, UploadRejectedRow
 from .audit import AuditLog
 
 __all__ = [
@@ -25,5 +25,7 @@ __all__ = [
     "DataModel",
     "DataRelationship",
     "UploadHistory",
+    "UploadReplacedRow",
+    "UploadRejectedRow",
     "AuditLog",
 ]
\ No newline at end of file
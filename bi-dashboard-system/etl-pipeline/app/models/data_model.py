@@ -20,6 +20,7 @@ class DataModel(Base):
     version = Column(Integer, default=1, nullable=False)
     is_active = Column(Integer, default=1, nullable=False)
     table_name = Column(String(255), nullable=True)  # Actual database table name
+    ingest_config = Column(JSON, nullable=True)  # Per-model ingestion options (batch sizes, etc.)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
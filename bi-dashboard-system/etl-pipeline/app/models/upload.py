@@ -2,7 +2,7 @@
 Upload History Model
 etl-pipeline/app/models/upload.py
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, BigInteger, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -18,13 +18,15 @@ class UploadHistory(Base):
     file_name = Column(String(500), nullable=False)
     file_path = Column(String(1000), nullable=True)
     file_size = Column(BigInteger, nullable=True)
-    status = Column(String(50), nullable=False)  # pending, processing, completed, failed, reverted
+    status = Column(String(50), nullable=False)  # preview, pending, processing, completed, failed, reverting, reverted, purged
     records_count = Column(Integer, default=0, nullable=True)
     records_success = Column(Integer, default=0, nullable=True)
     records_failed = Column(Integer, default=0, nullable=True)
     error_log = Column(Text, nullable=True)
     metadata_json = Column("metadata", Text, nullable=True)  # JSON string with additional info
     transaction_id = Column(String(100), nullable=True, index=True)  # For rollback capability
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the file, for duplicate detection
+    batch_id = Column(String(36), nullable=True, index=True)  # Shared by the uploads of one batch request
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     
@@ -33,4 +35,33 @@ class UploadHistory(Base):
     data_model = relationship("DataModel", back_populates="uploads")
     
     def __repr__(self):
-        return f"<UploadHistory(id={self.id}, file_name='{self.file_name}', status='{self.status}')>"
\ No newline at end of file
+        return f"<UploadHistory(id={self.id}, file_name='{self.file_name}', status='{self.status}')>"
+
+
+class UploadReplacedRow(Base):
+    """Previous values of a data row overwritten by a merge upload, kept for rollback"""
+    __tablename__ = "upload_replaced_rows"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    upload_id = Column(Integer, ForeignKey("upload_history.id", ondelete="CASCADE"), nullable=False, index=True)
+    row_id = Column(Integer, nullable=False)  # id of the row in the data model table
+    data = Column(JSON, nullable=False)  # Full row as it was before the merge
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<UploadReplacedRow(id={self.id}, upload_id={self.upload_id}, row_id={self.row_id})>"
+
+
+class UploadRejectedRow(Base):
+    """A row that failed validation, kept out of the data model table"""
+    __tablename__ = "upload_rejected_rows"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    upload_id = Column(Integer, ForeignKey("upload_history.id", ondelete="CASCADE"), nullable=False, index=True)
+    row_number = Column(Integer, nullable=False)  # Data row in the file, from 0
+    data = Column(JSON, nullable=False)  # Values as read from the file
+    errors = Column(JSON, nullable=False)  # List of {field, rule, error}
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<UploadRejectedRow(id={self.id}, upload_id={self.upload_id}, row_number={self.row_number})>"
\ No newline at end of file
@@ -17,6 +17,12 @@ class FieldDefinition(BaseModel):
     constraints: Optional[Dict[str, Any]] = None  # min, max, pattern, etc.
 
 
+class PartitionConfig(BaseModel):
+    strategy: str = Field(..., pattern="^(upload|date)$")  # uploads hashed over a fixed set of partitions, or one per month of field
+    field: Optional[str] = None  # required date field, for the date strategy
+    partitions: Optional[int] = None  # partition count for the upload strategy (default UPLOAD_PARTITIONS, at most 8192)
+
+
 class DataModelBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     display_name: str = Field(..., min_length=1, max_length=255)
@@ -25,12 +31,15 @@ class DataModelBase(BaseModel):
 
 class DataModelCreate(DataModelBase):
     schema_json: List[FieldDefinition]
+    ingest_config: Optional[Dict[str, Any]] = None  # batch sizes, mode (append, merge, delta), merge_key, delta_tombstones
+    partitioning: Optional[PartitionConfig] = None  # MySQL only; stored in ingest_config
 
 
 class DataModelUpdate(BaseModel):
     display_name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     schema_json: Optional[List[FieldDefinition]] = None
+    ingest_config: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
 
 
@@ -40,6 +49,7 @@ class DataModelResponse(DataModelBase):
     version: int
     is_active: bool
     table_name: Optional[str]
+    ingest_config: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
     
@@ -47,6 +57,18 @@ class DataModelResponse(DataModelBase):
         from_attributes = True
 
 
+class RetentionRequest(BaseModel):
+    before: datetime
+
+
+class RetentionResponse(BaseModel):
+    data_model_id: int
+    strategy: str
+    dropped_partitions: List[str]
+    rows_deleted: int = 0
+    uploads_purged: int
+
+
 class DataRelationshipCreate(BaseModel):
     name: str
     source_model_id: int
@@ -2,9 +2,10 @@
 Upload Schemas
 etl-pipeline/app/schemas/upload.py
 """
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+import json
 
 
 class UploadCreate(BaseModel):
@@ -24,9 +25,18 @@ class UploadResponse(BaseModel):
     records_failed: Optional[int]
     error_log: Optional[str]
     transaction_id: Optional[str]
+    metadata_json: Optional[Dict[str, Any]] = None  # content hash, progress, etc.
     created_at: datetime
     completed_at: Optional[datetime]
     
+    @field_validator("metadata_json", mode="before")
+    @classmethod
+    def parse_metadata(cls, value):
+        """metadata is stored as a JSON string on the model"""
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+    
     class Config:
         from_attributes = True
 
@@ -35,4 +45,56 @@ class UploadPreview(BaseModel):
     columns: list
     sample_data: list
     row_count: int
-    detected_types: dict
\ No newline at end of file
+    detected_types: dict
+    type_confidence: dict = {}  # Share of sampled values matching the detected type
+    upload_token: Optional[str] = None  # Pass to POST /uploads/ instead of the file
+    expires_at: Optional[datetime] = None
+
+
+class BatchUploadResponse(BaseModel):
+    batch_id: str
+    status: str  # processing, completed, partial, failed
+    files: int
+    records_count: int
+    records_success: int
+    records_failed: int
+    uploads: List[UploadResponse]
+
+
+class UploadStatsResponse(BaseModel):
+    model_id: int
+    uploads: int  # Completed uploads included
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    stages: Dict[str, Dict[str, Any]]  # Stage -> timing, throughput and memory aggregates
+
+
+class RejectedRowResponse(BaseModel):
+    row_number: int  # Data row in the file, from 0
+    data: Dict[str, Any]  # Values as read from the file
+    errors: List[Dict[str, Any]]  # {field, rule, error}
+    
+    class Config:
+        from_attributes = True
+
+
+class RejectedRowsResponse(BaseModel):
+    upload_id: int
+    rows: List[RejectedRowResponse]
+    total: int
+    limit: int
+    offset: int
+
+
+class DryRunResponse(BaseModel):
+    dry_run: bool = True
+    file_name: str
+    model_id: int
+    total_rows: int
+    valid_rows: int
+    invalid_rows: int
+    errors: List[Dict[str, Any]]  # File-level problems
+    row_errors: List[Dict[str, Any]]  # Sample of per-row violations, capped
+    constraint_violations: Dict[str, Dict[str, int]]  # field -> rule -> count
+    workers: int
+    seconds: float
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Adaptive Insert Batch Sizing
+etl-pipeline/app/services/batch_sizing.py
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Callable, Optional
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough on-the-wire size of one value per schema field type
+FIELD_TYPE_BYTES = {
+    'string': 64,
+    'text': 1024,
+    'number': 24,
+    'integer': 12,
+    'date': 28,
+    'datetime': 28,
+    'boolean': 6,
+}
+
+# transaction_id, separators and statement framing per row
+ROW_OVERHEAD_BYTES = 64
+
+# Fraction of max_allowed_packet a single batch may fill
+PACKET_FILL_RATIO = 0.5
+
+# Rows sampled when measuring actual row width
+OBSERVE_SAMPLE_ROWS = 1000
+
+# Size changes kept in the upload metadata
+MAX_HISTORY = 50
+
+
+def estimate_row_bytes(schema: List[Dict[str, Any]]) -> int:
+    """Estimate the bytes one row of a data model takes in an INSERT"""
+    return ROW_OVERHEAD_BYTES + sum(
+        FIELD_TYPE_BYTES.get(field.get('type', 'string'), FIELD_TYPE_BYTES['string'])
+        for field in schema
+    )
+
+
+def get_max_packet_bytes(db: Session) -> Optional[int]:
+    """Read max_allowed_packet from MySQL; None for other dialects"""
+    if db.get_bind().dialect.name != "mysql":
+        return None
+    try:
+        return int(db.execute(text("SELECT @@max_allowed_packet")).scalar())
+    except Exception as e:
+        logger.warning(f"Could not read max_allowed_packet: {e}")
+        return None
+
+
+class BatchSizer:
+    """
+    Chooses insert batch sizes for one upload
+    
+    The first size is the number of rows that fill batch_target_bytes at
+    the estimated row width, within the size bounds and the server's
+    packet limit. After each batch the size is moved toward the number of
+    rows that would take target_batch_seconds at the measured rate. Only
+    the statement itself is timed; loaders that send the whole upload in
+    one statement (LOAD DATA) are recorded without tuning.
+    
+    Per data model overrides come from DataModel.ingest_config:
+    batch_size (fixed size, disables tuning), batch_target_bytes,
+    min_batch_size, max_batch_size and target_batch_seconds.
+    """
+    
+    def __init__(
+        self,
+        schema: List[Dict[str, Any]] = None,
+        max_packet_bytes: int = None,
+        config: Dict[str, Any] = None
+    ):
+        config = config or {}
+        
+        self.row_bytes = estimate_row_bytes(schema or [])
+        self.max_packet_bytes = max_packet_bytes
+        self.min_size = int(config.get('min_batch_size', settings.UPLOAD_MIN_BATCH_SIZE))
+        self.max_size = int(config.get('max_batch_size', settings.UPLOAD_MAX_BATCH_SIZE))
+        self.target_seconds = float(
+            config.get('target_batch_seconds', settings.UPLOAD_BATCH_TARGET_SECONDS)
+        )
+        self.target_bytes = int(
+            config.get('batch_target_bytes', settings.UPLOAD_BATCH_TARGET_BYTES)
+        )
+        self.fixed = config.get('batch_size') is not None
+        
+        if self.fixed:
+            self.size = self._clamp(int(config['batch_size']))
+        else:
+            self.size = self._size_for_target_bytes()
+        self.initial_size = self.size
+        
+        self.batches = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+        self.history = [{"batch": 0, "size": self.size, "seconds": None}]
+    
+    @property
+    def packet_limit_rows(self) -> Optional[int]:
+        """Largest batch that fits in the packet limit, if there is one"""
+        if not self.max_packet_bytes:
+            return None
+        return max(1, int(self.max_packet_bytes * PACKET_FILL_RATIO / self.row_bytes))
+    
+    def _clamp(self, size: int) -> int:
+        upper = self.max_size
+        if self.packet_limit_rows is not None:
+            upper = min(upper, self.packet_limit_rows)
+        return max(1, min(max(size, self.min_size), upper))
+    
+    def _size_for_target_bytes(self) -> int:
+        return self._clamp(self.target_bytes // self.row_bytes)
+    
+    def observe_frame(self, df: pd.DataFrame) -> None:
+        """Raise the row width estimate if the data is wider than the schema suggests"""
+        if len(df) == 0:
+            return
+        
+        sample = df.head(OBSERVE_SAMPLE_ROWS)
+        measured = ROW_OVERHEAD_BYTES
+        for col in sample.columns:
+            series = sample[col]
+            if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                measured += int(series.astype(str).str.len().mean()) + 2
+            else:
+                measured += FIELD_TYPE_BYTES['number']
+        
+        if measured > self.row_bytes:
+            self.row_bytes = measured
+            if self.batches == 0 and not self.fixed:
+                # Nothing measured yet, so start from the corrected width
+                self.size = self.initial_size = self._size_for_target_bytes()
+                self.history[0]["size"] = self.size
+            else:
+                self.size = self._clamp(self.size)
+    
+    def next_size(self) -> int:
+        """Rows to put in the next batch"""
+        return self.size
+    
+    def record(self, rows: int, seconds: float, tune: bool = True) -> None:
+        """
+        Record a finished statement and retune the size from its latency
+        
+        Safe to call from the threads of a parallel insert.
+        
+        Args:
+            rows: Rows the statement wrote
+            seconds: Time the statement took
+            tune: False when the statement was not one batch, so its
+                latency says nothing about the batch size
+        """
+        with self._lock:
+            self.batches += 1
+            self.rows += rows
+            self.seconds += seconds
+            
+            if not tune or self.fixed or rows == 0 or seconds <= 0:
+                return
+            
+            ideal = rows / seconds * self.target_seconds
+            # Move halfway toward the ideal, never more than doubling at once
+            proposed = min(int((self.size + ideal) / 2), self.size * 2)
+            new_size = self._clamp(proposed)
+            
+            if abs(new_size - self.size) >= max(1, self.size // 10):
+                self.size = new_size
+                if len(self.history) < MAX_HISTORY:
+                    self.history.append({
+                        "batch": self.batches,
+                        "size": new_size,
+                        "seconds": round(seconds, 4)
+                    })
+    
+    def execute(self, batch: list, load: Callable[[list], None]) -> None:
+        """Run load on one batch, timing the load alone"""
+        start = time.perf_counter()
+        load(batch)
+        self.record(len(batch), time.perf_counter() - start)
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Chosen sizes and timings for the upload metadata
+        
+        insert_seconds is the time spent executing statements, summed over
+        connections when batches run in parallel.
+        """
+        return {
+            "row_bytes_estimate": self.row_bytes,
+            "target_bytes": self.target_bytes,
+            "max_packet_bytes": self.max_packet_bytes,
+            "initial_batch_size": self.initial_size,
+            "final_batch_size": self.size,
+            "fixed": self.fixed,
+            "batches": self.batches,
+            "rows": self.rows,
+            "insert_seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows / self.seconds) if self.seconds else None,
+            "history": self.history,
+        }
@@ -0,0 +1,329 @@
+"""
+Bulk Loader Strategies
+etl-pipeline/app/services/bulk_loader.py
+"""
+from sqlalchemy import text, bindparam, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+from datetime import datetime, date
+from itertools import repeat
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from ..database import engine
+from ..models.upload import UploadReplacedRow
+
+# A loader receives the target table, its column list and an iterable of
+# row batches (lists of tuples in column order).
+Loader = Callable[[Session, str, List[str], Iterable[List[Tuple]]], None]
+
+# Loaders that send every batch in a single statement, so a batch's
+# latency cannot be measured on its own
+SINGLE_STATEMENT_LOADERS = {"load_data_infile"}
+
+# Server warnings quoted in the error when LOAD DATA drops or alters rows
+INFILE_WARNINGS_SHOWN = 5
+
+# Keys per SELECT when reading the rows a merge batch replaces
+MERGE_LOOKUP_KEYS = 500
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    """Column as an object array of plain Python values, None for missing"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = np.asarray(series.dt.to_pydatetime(), dtype=object)
+    else:
+        values = series.to_numpy(dtype=object)
+    
+    missing = series.isna().to_numpy()
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def iter_row_batches(
+    df: pd.DataFrame,
+    batch_size: Union[int, Callable[[], int]],
+    constants: Dict[str, Any] = None
+) -> Iterator[List[Tuple]]:
+    """
+    Lazily slice a DataFrame into batches of DBAPI-ready row tuples
+    
+    Values are converted column by column for one batch at a time, so only
+    a single batch of Python objects exists at once and df is not modified.
+    
+    Args:
+        df: Frame to insert
+        batch_size: Rows per batch, or a callable asked before every batch
+        constants: Extra columns with the same value on every row, appended
+            after the frame's columns (e.g. transaction_id)
+    
+    Yields:
+        Lists of row tuples
+    """
+    constant_values = list((constants or {}).values())
+    
+    start = 0
+    while start < len(df):
+        size = batch_size() if callable(batch_size) else batch_size
+        batch = df.iloc[start:start + size]
+        start += size
+        
+        columns = [_column_values(batch[col]) for col in batch.columns]
+        columns.extend(repeat(value, len(batch)) for value in constant_values)
+        yield list(zip(*columns))
+
+
+def _quote(db: Session, name: str) -> str:
+    """Quote an identifier for the session's dialect"""
+    return db.get_bind().dialect.identifier_preparer.quote(name)
+
+
+def _placeholders(paramstyle: str, count: int) -> str:
+    """Positional placeholders for a single VALUES row"""
+    if paramstyle == "qmark":
+        return ", ".join(["?"] * count)
+    if paramstyle == "numeric":
+        return ", ".join(f":{i + 1}" for i in range(count))
+    return ", ".join(["%s"] * count)
+
+
+def sqlalchemy_load(
+    db: Session,
+    table_name: str,
+    columns: List[str],
+    batches: Iterable[List[Tuple]]
+) -> None:
+    """Generic path: text INSERT executed through the SQLAlchemy session"""
+    placeholders = ', '.join([f':{col}' for col in columns])
+    query = text(
+        f"INSERT INTO {table_name} ({', '.join(columns)}) "
+        f"VALUES ({placeholders})"
+    )
+    
+    for batch in batches:
+        db.execute(query, [dict(zip(columns, row)) for row in batch])
+
+
+def executemany_load(
+    db: Session,
+    table_name: str,
+    columns: List[str],
+    batches: Iterable[List[Tuple]]
+) -> None:
+    """
+    Raw DBAPI executemany on the session's connection
+    
+    PyMySQL rewrites an executemany INSERT into multi-row VALUES statements,
+    so each batch costs one round trip instead of one per row.
+    """
+    bind = db.get_bind()
+    query = (
+        f"INSERT INTO {_quote(db, table_name)} "
+        f"({', '.join(_quote(db, col) for col in columns)}) "
+        f"VALUES ({_placeholders(bind.dialect.paramstyle, len(columns))})"
+    )
+    
+    # Stays inside the session transaction, so commit/rollback still apply
+    dbapi_conn = db.connection().connection
+    cursor = dbapi_conn.cursor()
+    try:
+        for batch in batches:
+            cursor.executemany(query, batch)
+    finally:
+        cursor.close()
+
+
+def _infile_value(value: Any) -> str:
+    """Format a value for LOAD DATA's default tab-separated format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    if isinstance(value, date):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def load_data_infile(
+    db: Session,
+    table_name: str,
+    columns: List[str],
+    batches: Iterable[List[Tuple]]
+) -> None:
+    """
+    MySQL LOAD DATA LOCAL INFILE from a temporary tab-separated file
+    
+    Requires MYSQL_LOCAL_INFILE=True and local_infile enabled on the server.
+    With LOCAL, the server skips duplicate keys and truncates bad values
+    with a warning instead of failing, so the rows loaded and the warnings
+    are checked afterwards and any difference raises, as an INSERT would.
+    """
+    rows_sent = 0
+    fd, tmp_path = tempfile.mkstemp(suffix=".tsv", dir=settings.UPLOAD_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as tmp:
+            for batch in batches:
+                tmp.writelines(
+                    "\t".join(map(_infile_value, row)) + "\n"
+                    for row in batch
+                )
+                rows_sent += len(batch)
+        
+        query = (
+            f"LOAD DATA LOCAL INFILE '{tmp_path}' "
+            f"INTO TABLE {_quote(db, table_name)} "
+            f"CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' "
+            f"({', '.join(_quote(db, col) for col in columns)})"
+        )
+        
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.execute(query)
+            rows_loaded = cursor.rowcount
+            # Must run right after the load, on the same connection
+            cursor.execute("SHOW WARNINGS")
+            warnings = [row for row in cursor.fetchall() if row[0] != "Note"]
+        finally:
+            cursor.close()
+    finally:
+        os.remove(tmp_path)
+    
+    if rows_loaded != rows_sent or warnings:
+        details = "; ".join(str(row[2]) for row in warnings[:INFILE_WARNINGS_SHOWN])
+        raise ValueError(
+            f"LOAD DATA loaded {rows_loaded} of {rows_sent} rows "
+            f"with {len(warnings)} warnings" + (f": {details}" if details else "")
+        )
+
+
+def _record_replaced_rows(
+    db: Session,
+    table_name: str,
+    key_column: str,
+    keys: List[Any],
+    transaction_id: str,
+    upload_id: int
+) -> int:
+    """Copy the existing rows a merge is about to overwrite into upload_replaced_rows"""
+    query = text(
+        f"SELECT * FROM {_quote(db, table_name)} "
+        f"WHERE {_quote(db, key_column)} IN :keys "
+        f"AND (transaction_id IS NULL OR transaction_id != :transaction_id)"
+    ).bindparams(bindparam("keys", expanding=True))
+    
+    recorded = 0
+    for start in range(0, len(keys), MERGE_LOOKUP_KEYS):
+        rows = db.execute(query, {
+            "keys": keys[start:start + MERGE_LOOKUP_KEYS],
+            "transaction_id": transaction_id
+        }).mappings().all()
+        if rows:
+            db.execute(insert(UploadReplacedRow), [
+                {
+                    "upload_id": upload_id,
+                    "row_id": row["id"],
+                    "data": json.loads(json.dumps(dict(row), default=str))
+                }
+                for row in rows
+            ])
+            recorded += len(rows)
+    return recorded
+
+
+def merge_load(
+    db: Session,
+    table_name: str,
+    columns: List[str],
+    batches: Iterable[List[Tuple]],
+    key_column: str,
+    transaction_id: str,
+    upload_id: int
+) -> None:
+    """
+    Upsert batches keyed on a unique column
+    
+    MySQL uses INSERT ... ON DUPLICATE KEY UPDATE, other dialects
+    (SQLite for local runs) INSERT ... ON CONFLICT DO UPDATE. Before each
+    batch is written, the rows it overwrites are copied to
+    upload_replaced_rows in the same transaction, so the upload can be
+    rolled back. Bind with functools.partial to get a Loader.
+    """
+    bind = db.get_bind()
+    quoted = [_quote(db, col) for col in columns]
+    updates = [
+        (col, quoted_col) for col, quoted_col in zip(columns, quoted)
+        if col != key_column
+    ]
+    
+    query = (
+        f"INSERT INTO {_quote(db, table_name)} ({', '.join(quoted)}) "
+        f"VALUES ({_placeholders(bind.dialect.paramstyle, len(columns))}) "
+    )
+    if bind.dialect.name == "mysql":
+        query += "ON DUPLICATE KEY UPDATE " + ", ".join(
+            f"{quoted_col} = VALUES({quoted_col})" for _, quoted_col in updates
+        )
+    else:
+        query += f"ON CONFLICT ({_quote(db, key_column)}) DO UPDATE SET " + ", ".join(
+            f"{quoted_col} = excluded.{quoted_col}" for _, quoted_col in updates
+        )
+    
+    key_index = columns.index(key_column)
+    cursor = db.connection().connection.cursor()
+    try:
+        for batch in batches:
+            keys = [row[key_index] for row in batch if row[key_index] is not None]
+            _record_replaced_rows(db, table_name, key_column, keys, transaction_id, upload_id)
+            cursor.executemany(query, batch)
+    finally:
+        cursor.close()
+
+
+LOADERS: Dict[str, Loader] = {
+    "load_data_infile": load_data_infile,
+    "executemany": executemany_load,
+    "sqlalchemy": sqlalchemy_load,
+}
+
+
+def select_loader(bind: Engine = None) -> str:
+    """
+    Pick the bulk load strategy for an engine's dialect
+    
+    Args:
+        bind: Engine to load into (default: database.engine)
+    
+    Returns:
+        Name of a strategy in LOADERS
+    """
+    if bind is None:
+        bind = engine
+    
+    strategy = settings.BULK_LOAD_STRATEGY
+    if strategy != "auto":
+        if strategy not in LOADERS:
+            raise ValueError(f"Unknown bulk load strategy: {strategy}")
+        if strategy == "load_data_infile" and bind.dialect.name != "mysql":
+            raise ValueError("load_data_infile is only supported on MySQL")
+        return strategy
+    
+    if bind.dialect.name == "mysql" and settings.MYSQL_LOCAL_INFILE:
+        return "load_data_infile"
+    return "executemany"
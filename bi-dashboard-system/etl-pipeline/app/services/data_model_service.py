@@ -2,16 +2,21 @@
 Data Model Service
 etl-pipeline/app/services/data_model_service.py
 """
-from sqlalchemy import text, MetaData, Table, Column, Integer, String, Float, DateTime, Boolean, Text
+from sqlalchemy import text, inspect, MetaData, Table, Column, Integer, BigInteger, String, Float, DateTime, Boolean, Text
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from typing import List, Dict, Any
+from datetime import datetime
+import base64
 import json
 
 from ..models.data_model import DataModel, DataRelationship
+from ..models.upload import UploadHistory
 from ..schemas.data_model import DataModelCreate, DataModelUpdate, DataRelationshipCreate
 from ..utils.audit import log_audit
 from ..database import engine
+from .delta_ingest import ROW_HASH_COLUMN
+from . import partitioning
 
 
 class DataModelService:
@@ -36,12 +41,28 @@ class DataModelService:
         # Generate table name
         table_name = f"dm_{model_data.name.lower().replace(' ', '_')}"
         
+        schema = [field.dict() for field in model_data.schema_json]
+        ingest_config = model_data.ingest_config
+        if model_data.partitioning is not None:
+            partition_config = model_data.partitioning.dict()
+            try:
+                partitioning.validate_partitioning(
+                    partition_config, schema, db.get_bind().dialect.name
+                )
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            ingest_config = {**(ingest_config or {}), "partitioning": partition_config}
+        
         # Create data model record
         data_model = DataModel(
             name=model_data.name,
             display_name=model_data.display_name,
             description=model_data.description,
-            schema_json=[field.dict() for field in model_data.schema_json],
+            schema_json=schema,
+            ingest_config=ingest_config,
             table_name=table_name,
             created_by=user_id,
             version=1
@@ -53,7 +74,11 @@ class DataModelService:
         
         # Create physical database table
         try:
-            DataModelService._create_physical_table(table_name, model_data.schema_json)
+            DataModelService._create_physical_table(
+                table_name,
+                data_model.schema_json,
+                ingest_config
+            )
         except Exception as e:
             db.delete(data_model)
             db.commit()
@@ -75,7 +100,11 @@ class DataModelService:
         return data_model
     
     @staticmethod
-    def _create_physical_table(table_name: str, schema: List[Dict[str, Any]]) -> None:
+    def _create_physical_table(
+        table_name: str,
+        schema: List[Dict[str, Any]],
+        ingest_config: Dict[str, Any] = None
+    ) -> None:
         """Create physical database table based on schema"""
         
         # Map field types to SQLAlchemy types
@@ -89,6 +118,14 @@ class DataModelService:
             'boolean': Boolean
         }
         
+        # MySQL needs the partitioning column in the primary key
+        partition_config = (ingest_config or {}).get('partitioning')
+        partition_column = None
+        table_options = {}
+        if partition_config:
+            partition_column = partitioning.partition_column(partition_config)
+            table_options['mysql_partition_by'] = partitioning.partition_by_clause(partition_config)
+        
         # Build columns
         columns = [Column('id', Integer, primary_key=True, autoincrement=True)]
         
@@ -100,9 +137,22 @@ class DataModelService:
             unique = field.get('unique', False)
             
             columns.append(
-                Column(field['name'], sql_type, nullable=nullable, unique=unique)
+                Column(
+                    field['name'], sql_type, nullable=nullable, unique=unique,
+                    primary_key=field['name'] == partition_column
+                )
             )
         
+        # Uploads tag their rows so they can be rolled back
+        if partition_column == 'transaction_id':
+            columns.append(Column('transaction_id', String(100), primary_key=True, server_default='', index=True))
+        else:
+            columns.append(Column('transaction_id', String(100), nullable=True, index=True))
+        
+        # Delta uploads look rows up by fingerprint
+        if (ingest_config or {}).get('mode') == 'delta':
+            columns.append(Column(ROW_HASH_COLUMN, BigInteger, nullable=True, index=True))
+        
         # Add metadata columns
         columns.extend([
             Column('created_at', DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP')),
@@ -111,9 +161,32 @@ class DataModelService:
         
         # Create table
         metadata = MetaData()
-        table = Table(table_name, metadata, *columns)
+        table = Table(table_name, metadata, *columns, **table_options)
         metadata.create_all(engine)
     
+    @staticmethod
+    def ensure_transaction_column(db: Session, table_name: str) -> None:
+        """
+        Add an indexed transaction_id column to a table created without one
+        
+        Tables created before uploads were tagged lack the column, which
+        makes every rollback a full table scan.
+        """
+        inspector = inspect(db.get_bind())
+        columns = {col['name'] for col in inspector.get_columns(table_name)}
+        if 'transaction_id' not in columns:
+            db.execute(text(f"ALTER TABLE {table_name} ADD COLUMN transaction_id VARCHAR(100) NULL"))
+        
+        indexed = any(
+            index['column_names'][:1] == ['transaction_id']
+            for index in inspector.get_indexes(table_name)
+        )
+        if not indexed:
+            db.execute(text(
+                f"CREATE INDEX ix_{table_name}_transaction_id ON {table_name} (transaction_id)"
+            ))
+        db.commit()
+    
     @staticmethod
     def get_all_data_models(db: Session, include_inactive: bool = False) -> List[DataModel]:
         """Get all data models"""
@@ -150,6 +223,13 @@ class DataModelService:
             model.description = model_update.description
         if model_update.is_active is not None:
             model.is_active = 1 if model_update.is_active else 0
+        if model_update.ingest_config is not None:
+            # The table layout is fixed at creation, so partitioning is kept
+            ingest_config = dict(model_update.ingest_config)
+            ingest_config.pop('partitioning', None)
+            if (model.ingest_config or {}).get('partitioning'):
+                ingest_config['partitioning'] = model.ingest_config['partitioning']
+            model.ingest_config = ingest_config
         
         # Schema updates require versioning
         if model_update.schema_json is not None:
@@ -190,6 +270,83 @@ class DataModelService:
             details={"name": model.name}
         )
     
+    @staticmethod
+    def apply_retention(
+        db: Session,
+        model_id: int,
+        before: datetime,
+        user_id: int
+    ) -> Dict[str, Any]:
+        """
+        Drop data older than a cutoff from a partitioned data model
+        
+        With date partitioning every month ending on or before the cutoff
+        is dropped as a whole partition, so the cost does not depend on the
+        number of rows. With upload partitioning the rows of uploads made
+        before the cutoff are deleted, each delete pruned to the partition
+        holding the upload, and those uploads are marked purged.
+        
+        Args:
+            db: Database session
+            model_id: Data model ID
+            before: Cutoff
+            user_id: User applying the retention
+        
+        Returns:
+            Dropped partitions, rows deleted and number of uploads purged
+        """
+        model = DataModelService.get_data_model_by_id(db, model_id)
+        partition_config = (model.ingest_config or {}).get('partitioning')
+        if not partition_config:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Data model table is not partitioned"
+            )
+        
+        dropped = []
+        rows_deleted = 0
+        uploads = []
+        if partition_config['strategy'] == 'upload':
+            uploads = db.query(UploadHistory).filter(
+                UploadHistory.model_id == model.id,
+                UploadHistory.status == "completed",
+                UploadHistory.created_at < before
+            ).all()
+            for upload in uploads:
+                rows_deleted += partitioning.delete_upload_rows(
+                    db,
+                    model.table_name,
+                    upload.transaction_id
+                )
+                upload.status = "purged"
+                db.commit()
+        else:
+            dropped = partitioning.drop_partitions_before(db, model.table_name, before)
+            db.commit()
+        
+        # Log audit
+        log_audit(
+            db=db,
+            user_id=user_id,
+            action="retention",
+            resource="data_model",
+            resource_id=model.id,
+            details={
+                "before": before.isoformat(),
+                "dropped_partitions": dropped,
+                "rows_deleted": rows_deleted,
+                "uploads_purged": len(uploads)
+            }
+        )
+        
+        return {
+            "data_model_id": model.id,
+            "strategy": partition_config['strategy'],
+            "dropped_partitions": dropped,
+            "rows_deleted": rows_deleted,
+            "uploads_purged": len(uploads)
+        }
+    
     @staticmethod
     def create_relationship(
         db: Session,
@@ -231,14 +388,82 @@ class DataModelService:
         
         return relationship
     
+    @staticmethod
+    def _indexed_columns(db: Session, table_name: str) -> List[str]:
+        """Columns that lead an index or unique constraint"""
+        inspector = inspect(db.get_bind())
+        columns = {col['name'] for col in inspector.get_columns(table_name)}
+        
+        leading = set(inspector.get_pk_constraint(table_name).get('constrained_columns', [])[:1])
+        leading.update(
+            index['column_names'][0]
+            for index in inspector.get_indexes(table_name)
+            if index['column_names'] and index['column_names'][0]
+        )
+        leading.update(
+            constraint['column_names'][0]
+            for constraint in inspector.get_unique_constraints(table_name)
+            if constraint['column_names']
+        )
+        return sorted(leading & columns)
+    
+    @staticmethod
+    def _encode_cursor(order_by: str, direction: str, row: Dict[str, Any]) -> str:
+        """Opaque continuation token pointing just after row"""
+        # Values go back to the driver in the type it returned them as
+        value = row[order_by]
+        position = {"o": order_by, "d": direction, "v": value, "id": row['id']}
+        if isinstance(value, datetime):
+            position.update(v=value.isoformat(), t="datetime")
+        payload = json.dumps(position, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            decoded = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not {"o", "d", "v", "id"} <= decoded.keys():
+                raise ValueError(cursor)
+            return decoded
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
     @staticmethod
     def get_model_data(
         db: Session,
         model_id: int,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: str = None,
+        order_by: str = None,
+        direction: str = None
     ) -> Dict[str, Any]:
-        """Get data from a data model table"""
+        """
+        Get data from a data model table, one page at a time
+        
+        Rows are ordered by order_by (an indexed column, default id) with id
+        as the tie-breaker. Pass the returned next_cursor to get the next
+        page: it seeks straight to the last row seen, so deep pages cost
+        about the same as the first. offset still works for the first
+        request but scans the rows it skips.
+        
+        Args:
+            db: Database session
+            model_id: Data model ID
+            limit: Rows per page
+            offset: Rows to skip when no cursor is given
+            cursor: next_cursor of the previous page
+            order_by: Indexed column to order by (default: id)
+            direction: asc (default) or desc
+        
+        Returns:
+            Rows, next_cursor (None on the last page) and, for requests
+            without a cursor, the total row count
+        """
         model = DataModelService.get_data_model_by_id(db, model_id)
         
         if not model.table_name:
@@ -247,23 +472,88 @@ class DataModelService:
                 detail="Data model has no associated table"
             )
         
-        # Query the dynamic table
-        query = text(f"SELECT * FROM {model.table_name} LIMIT :limit OFFSET :offset")
-        result = db.execute(query, {"limit": limit, "offset": offset})
+        position = None
+        if cursor:
+            position = DataModelService._decode_cursor(cursor)
+            order_by = order_by or position["o"]
+            direction = position["d"] if direction is None else direction
+            if (order_by, direction) != (position["o"], position["d"]):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor was issued for a different ordering"
+                )
+        
+        order_by = order_by or "id"
+        direction = (direction or "asc").lower()
+        if direction not in ("asc", "desc"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="direction must be asc or desc"
+            )
+        
+        indexed = DataModelService._indexed_columns(db, model.table_name)
+        if order_by not in indexed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"order_by must be an indexed column: {', '.join(indexed)}"
+            )
+        
+        # Seek past the last row of the previous page instead of skipping rows
+        where = ""
+        params = {"limit": limit + 1}
+        if position is not None:
+            after, before = (">", "<") if direction == "asc" else ("<", ">")
+            params["last_id"] = position["id"]
+            if order_by == "id":
+                where = f"WHERE id {after} :last_id"
+            elif position["v"] is None:
+                # NULLs sort first ascending and last descending
+                if direction == "asc":
+                    where = f"WHERE ({order_by} IS NULL AND id > :last_id) OR {order_by} IS NOT NULL"
+                else:
+                    where = f"WHERE {order_by} IS NULL AND id < :last_id"
+            else:
+                value = position["v"]
+                if position.get("t") == "datetime":
+                    value = datetime.fromisoformat(value)
+                params["last_value"] = value
+                where = (
+                    f"WHERE ({order_by} {after} :last_value "
+                    f"OR ({order_by} = :last_value AND id {after} :last_id)"
+                    + (f" OR {order_by} IS NULL)" if direction == "desc" else ")")
+                )
+        
+        sql = f"SELECT * FROM {model.table_name} {where} ORDER BY "
+        sql += "id" if order_by == "id" else f"{order_by} {direction.upper()}, id"
+        sql += f" {direction.upper()} LIMIT :limit"
+        if position is None and offset:
+            sql += " OFFSET :offset"
+            params["offset"] = offset
+        
+        result = db.execute(text(sql), params)
         
         # Get column names
         columns = result.keys()
         
-        # Fetch rows
+        # Fetch rows; the extra one tells whether there is a next page
         rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = DataModelService._encode_cursor(order_by, direction, rows[-1])
         
-        # Get total count
-        count_query = text(f"SELECT COUNT(*) as total FROM {model.table_name}")
-        total = db.execute(count_query).scalar()
+        # Counting scans the table, so only the first request pays for it
+        total = None
+        if position is None:
+            count_query = text(f"SELECT COUNT(*) as total FROM {model.table_name}")
+            total = db.execute(count_query).scalar()
         
         return {
             "data": rows,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset if position is None else None,
+            "order_by": order_by,
+            "direction": direction,
+            "next_cursor": next_cursor
         }
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Partitioned Data Model Tables (MySQL)
+etl-pipeline/app/services/partitioning.py
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List
+from datetime import datetime
+import logging
+
+import pandas as pd
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Catch-all partition created with date-partitioned tables
+FUTURE_PARTITION = "p_future"
+
+# MySQL refuses to create more partitions than this on one table
+MAX_PARTITIONS = 8192
+
+
+def validate_partitioning(
+    partitioning: Dict[str, Any],
+    schema: List[Dict[str, Any]],
+    dialect: str
+) -> None:
+    """
+    Check a partitioning option against the model and database
+    
+    MySQL requires the partitioning column in every unique key, so models
+    with unique fields cannot be partitioned. A table holds at most
+    MAX_PARTITIONS partitions: the upload strategy hashes uploads into a
+    fixed number of them, the date strategy adds one per month of data.
+    
+    Raises:
+        ValueError: If the table cannot be partitioned this way
+    """
+    if dialect != "mysql":
+        raise ValueError("Partitioned tables are only supported on MySQL")
+    
+    if any(field.get('unique', False) for field in schema):
+        raise ValueError("Data models with unique fields cannot be partitioned")
+    
+    strategy = partitioning.get('strategy')
+    if strategy == 'upload':
+        count = upload_partition_count(partitioning)
+        if not 1 <= count <= MAX_PARTITIONS:
+            raise ValueError(f"Upload partitioning needs between 1 and {MAX_PARTITIONS} partitions")
+        return
+    if strategy != 'date':
+        raise ValueError("Partitioning strategy must be 'upload' or 'date'")
+    
+    fields = {field['name']: field for field in schema}
+    field = fields.get(partitioning.get('field'))
+    if not field or field.get('type') not in ('date', 'datetime'):
+        raise ValueError("Date partitioning needs a date field from the schema")
+    if not field.get('required', False):
+        raise ValueError("The date partitioning field must be required")
+
+
+def partition_column(partitioning: Dict[str, Any]) -> str:
+    """Column the table is partitioned on; it joins id in the primary key"""
+    if partitioning['strategy'] == 'upload':
+        return 'transaction_id'
+    return partitioning['field']
+
+
+def upload_partition_count(partitioning: Dict[str, Any]) -> int:
+    """Number of hash partitions of a table using the upload strategy"""
+    return int(partitioning.get('partitions') or settings.UPLOAD_PARTITIONS)
+
+
+def partition_by_clause(partitioning: Dict[str, Any]) -> str:
+    """PARTITION BY clause (without the keyword) for a new table"""
+    if partitioning['strategy'] == 'upload':
+        # A fixed partition count: one partition per upload would hit
+        # MAX_PARTITIONS on a busy model. Deletes by transaction_id are
+        # still pruned to the single partition holding the upload.
+        return f"KEY(transaction_id) PARTITIONS {upload_partition_count(partitioning)}"
+    return (
+        f"RANGE COLUMNS({partitioning['field']}) "
+        f"(PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"
+    )
+
+
+def _month_partition_name(month: pd.Timestamp) -> str:
+    return f"p_{month.strftime('%Y%m')}"
+
+
+def _partitions(db: Session, table_name: str) -> Dict[str, str]:
+    """Partition name -> description (list values or upper bound)"""
+    rows = db.execute(text(
+        "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name "
+        "AND PARTITION_NAME IS NOT NULL"
+    ), {"table_name": table_name}).all()
+    return {name: description for name, description in rows}
+
+
+def ensure_date_partitions(
+    db: Session,
+    table_name: str,
+    partitioning: Dict[str, Any],
+    values: pd.Series
+) -> List[str]:
+    """
+    Split monthly partitions off the empty MAXVALUE partition for new dates
+    
+    Every month from the current highest bound up to the latest date in
+    values gets its own partition, so rows never land in FUTURE_PARTITION.
+    Dates below the lowest bound go into the lowest partition.
+    
+    Returns:
+        Names of the partitions created
+    """
+    dates = pd.to_datetime(values, errors='coerce').dropna()
+    if dates.empty:
+        return []
+    
+    last_month = dates.max().to_period('M').to_timestamp()
+    bounds = [
+        pd.Timestamp(description.strip("'"))
+        for name, description in _partitions(db, table_name).items()
+        if name != FUTURE_PARTITION
+    ]
+    if bounds:
+        first_month = max(bounds)
+    else:
+        first_month = dates.min().to_period('M').to_timestamp()
+    if last_month < first_month:
+        return []
+    
+    months = pd.date_range(first_month, last_month, freq='MS')
+    if len(bounds) + len(months) + 1 > MAX_PARTITIONS:
+        raise ValueError(
+            f"Dates up to {last_month.strftime('%Y-%m')} would need more than "
+            f"{MAX_PARTITIONS} monthly partitions"
+        )
+    definitions = [
+        f"PARTITION {_month_partition_name(month)} VALUES LESS THAN "
+        f"('{(month + pd.offsets.MonthBegin(1)).strftime('%Y-%m-%d')}')"
+        for month in months
+    ]
+    definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    
+    db.execute(text(
+        f"ALTER TABLE {table_name} REORGANIZE PARTITION {FUTURE_PARTITION} "
+        f"INTO ({', '.join(definitions)})"
+    ))
+    return [_month_partition_name(month) for month in months]
+
+
+def delete_upload_rows(db: Session, table_name: str, transaction_id: str) -> int:
+    """
+    Delete an upload's rows from a table using the upload strategy
+    
+    The equality on transaction_id prunes every statement to one
+    partition. Rows go in chunks of ROLLBACK_CHUNK_SIZE, committing after
+    each one, like an upload rollback.
+    
+    Returns:
+        Number of rows deleted
+    """
+    chunk_size = settings.ROLLBACK_CHUNK_SIZE
+    query = text(
+        f"DELETE FROM {table_name} WHERE transaction_id = :transaction_id LIMIT :chunk_size"
+    )
+    
+    total = 0
+    while True:
+        deleted = db.execute(
+            query, {"transaction_id": transaction_id, "chunk_size": chunk_size}
+        ).rowcount
+        db.commit()
+        total += deleted
+        if deleted < chunk_size:
+            return total
+
+
+def drop_partitions_before(
+    db: Session,
+    table_name: str,
+    before: datetime
+) -> List[str]:
+    """
+    Drop the monthly partitions of a date-partitioned table ending on or before a cutoff
+    
+    Returns:
+        Names of the dropped partitions
+    """
+    cutoff = pd.Timestamp(before)
+    names = [
+        name for name, description in _partitions(db, table_name).items()
+        if name != FUTURE_PARTITION and pd.Timestamp(description.strip("'")) <= cutoff
+    ]
+    
+    if names:
+        db.execute(text(f"ALTER TABLE {table_name} DROP PARTITION {', '.join(names)}"))
+        logger.info(f"Dropped {len(names)} partitions of {table_name}")
+    return names
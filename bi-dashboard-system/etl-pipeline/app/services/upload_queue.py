@@ -0,0 +1,68 @@
+"""
+Upload Job Queue
+etl-pipeline/app/services/upload_queue.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import threading
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the worker pool on first use"""
+    global _executor, _slots
+    
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.UPLOAD_WORKERS,
+                thread_name_prefix="upload-worker"
+            )
+            # Jobs waiting or running; bounds the backlog held in memory
+            _slots = threading.BoundedSemaphore(settings.UPLOAD_QUEUE_SIZE)
+        return _executor
+
+
+def submit_upload_job(fn: Callable, *args, **kwargs) -> bool:
+    """
+    Queue a job on the upload worker pool
+    
+    Args:
+        fn: Callable to run in a worker thread
+        *args, **kwargs: Arguments passed to fn
+    
+    Returns:
+        True if the job was queued, False if the queue is full
+    """
+    executor = _get_executor()
+    
+    if not _slots.acquire(blocking=False):
+        logger.warning("Upload queue is full, rejecting job")
+        return False
+    
+    try:
+        future = executor.submit(fn, *args, **kwargs)
+    except Exception:
+        _slots.release()
+        raise
+    
+    future.add_done_callback(lambda _: _slots.release())
+    return True
+
+
+def shutdown_upload_workers() -> None:
+    """Stop the worker pool, dropping jobs that have not started yet"""
+    global _executor
+    
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
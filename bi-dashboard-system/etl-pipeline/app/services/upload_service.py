@@ -2,19 +2,54 @@
 Upload Service
 etl-pipeline/app/services/upload_service.py
 """
-from sqlalchemy import text, insert
+from sqlalchemy import text, insert, bindparam, inspect
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, UploadFile
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Tuple, Callable, Optional
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+import logging
+import os
+import time
 import uuid
+import zipfile
 
-from ..models.upload import UploadHistory
+from ..models.upload import UploadHistory, UploadReplacedRow, UploadRejectedRow
 from ..models.data_model import DataModel
-from ..utils.file_handler import validate_file, save_upload_file, read_file_preview, process_upload
+from ..utils.file_handler import (
+    validate_file,
+    get_file_extension,
+    stream_upload_file,
+    extract_archive,
+    read_file_preview,
+    process_upload_chunks,
+    new_validation_results
+)
 from ..utils.audit import log_audit
-from ..database import engine
+from ..utils.constraints import get_compiled_constraints
+from ..utils.metrics import StageTimer, aggregate_stages, frame_bytes
+from ..utils.parallel_validation import validate_file_parallel
+from ..database import engine, SessionLocal
+from ..config import settings
+from .upload_queue import submit_upload_job
+from .bulk_loader import Loader, LOADERS, SINGLE_STATEMENT_LOADERS, select_loader, iter_row_batches, merge_load
+from .batch_sizing import BatchSizer, get_max_packet_bytes
+from .delta_ingest import DeltaFilter, ensure_row_hash_column
+from .data_model_service import DataModelService
+from . import partitioning
+
+logger = logging.getLogger(__name__)
+
+# append inserts every row; merge upserts on the model's unique key;
+# delta inserts only rows whose fingerprint is not in the table yet
+INGEST_MODES = ("append", "merge", "delta")
+
+# Replaced rows restored per query when rolling back a merge
+RESTORE_PAGE_SIZE = 5000
 
 
 class UploadService:
@@ -28,15 +63,180 @@ class UploadService:
         """Preview uploaded file before import"""
         return read_file_preview(file_path, rows)
     
+    @staticmethod
+    def create_upload_session(
+        db: Session,
+        file: UploadFile,
+        user_id: int,
+        rows: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Spool a file, preview it and keep it for a later commit
+        
+        The file is stored once; POST /uploads/ can then refer to the
+        returned upload_token instead of sending the file again. Sessions
+        that are not committed expire after UPLOAD_SESSION_TTL_MINUTES.
+        
+        Returns:
+            Preview data with upload_token and expires_at
+        """
+        
+        # Validate file
+        is_valid, error_msg = validate_file(file.filename, file.size)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_msg
+            )
+        
+        UploadService.cleanup_expired_sessions(db)
+        
+        timer = StageTimer()
+        with timer.stage("save") as stage:
+            file_path, content_hash, file_size = stream_upload_file(file)
+            stage.bytes += file_size
+        
+        with timer.stage("preview"):
+            preview_data = read_file_preview(file_path, rows=rows, content_hash=content_hash)
+        if not preview_data.get('success'):
+            os.remove(file_path)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=preview_data.get('error', 'Failed to preview file')
+            )
+        
+        expires_at = datetime.utcnow() + timedelta(minutes=settings.UPLOAD_SESSION_TTL_MINUTES)
+        session_record = UploadHistory(
+            user_id=user_id,
+            file_name=file.filename,
+            file_path=file_path,
+            file_size=file_size,
+            status="preview",
+            transaction_id=str(uuid.uuid4()),
+            content_hash=content_hash
+        )
+        UploadService._update_metadata(
+            session_record,
+            content_hash=content_hash,
+            stages=timer.summary(),
+            expires_at=expires_at.isoformat(),
+            preview={
+                "columns": preview_data["columns"],
+                "detected_types": preview_data["detected_types"],
+                "type_confidence": preview_data["type_confidence"]
+            }
+        )
+        
+        db.add(session_record)
+        db.commit()
+        
+        return {
+            **preview_data,
+            "upload_token": session_record.transaction_id,
+            "expires_at": expires_at
+        }
+    
+    @staticmethod
+    def commit_upload_session(
+        db: Session,
+        upload_token: str,
+        model_id: int,
+        user_id: int,
+        column_mapping: Dict[str, str] = None,
+        mode: str = None
+    ) -> UploadHistory:
+        """Queue the file of a preview session for processing"""
+        
+        UploadService._check_mode(mode)
+        
+        session_record = db.query(UploadHistory).filter(
+            UploadHistory.transaction_id == upload_token,
+            UploadHistory.status == "preview",
+            UploadHistory.user_id == user_id
+        ).first()
+        if not session_record:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found"
+            )
+        
+        metadata = UploadService._get_metadata(session_record)
+        expires_at = metadata.get("expires_at")
+        if (expires_at and datetime.fromisoformat(expires_at) < datetime.utcnow()) \
+                or not os.path.exists(session_record.file_path):
+            UploadService._discard_session(db, session_record)
+            db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload session has expired"
+            )
+        
+        # Get data model
+        data_model = db.query(DataModel).filter(DataModel.id == model_id).first()
+        if not data_model:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Data model not found"
+            )
+        
+        session_record.model_id = model_id
+        session_record.status = "pending"
+        session_record.created_at = datetime.utcnow()
+        UploadService._update_metadata(session_record, expires_at=None)
+        
+        return UploadService._queue_upload(
+            db,
+            session_record,
+            data_model,
+            metadata["content_hash"],
+            column_mapping,
+            mode
+        )
+    
+    @staticmethod
+    def _discard_session(db: Session, session_record: UploadHistory) -> None:
+        """Remove a preview session and its spooled file; the caller commits"""
+        if session_record.file_path and os.path.exists(session_record.file_path):
+            os.remove(session_record.file_path)
+        db.delete(session_record)
+    
+    @staticmethod
+    def cleanup_expired_sessions(db: Session) -> int:
+        """
+        Delete preview sessions past their TTL together with their files
+        
+        Returns:
+            Number of sessions removed
+        """
+        cutoff = datetime.utcnow() - timedelta(minutes=settings.UPLOAD_SESSION_TTL_MINUTES)
+        expired = db.query(UploadHistory).filter(
+            UploadHistory.status == "preview",
+            UploadHistory.created_at < cutoff
+        ).all()
+        
+        for session_record in expired:
+            try:
+                UploadService._discard_session(db, session_record)
+            except OSError as e:
+                logger.warning(f"Could not remove file of upload session {session_record.id}: {e}")
+        db.commit()
+        
+        if expired:
+            logger.info(f"Removed {len(expired)} expired upload sessions")
+        return len(expired)
+    
     @staticmethod
     def upload_file(
         db: Session,
         file: UploadFile,
         model_id: int,
         user_id: int,
-        column_mapping: Dict[str, str] = None
+        column_mapping: Dict[str, str] = None,
+        mode: str = None
     ) -> UploadHistory:
-        """Upload and process file"""
+        """Save file and queue it for background processing"""
+        
+        UploadService._check_mode(mode)
         
         # Validate file
         is_valid, error_msg = validate_file(file.filename, file.size)
@@ -55,40 +255,656 @@ class UploadService:
             )
         
         # Save file
-        file_path = save_upload_file(file)
+        timer = StageTimer()
+        with timer.stage("save") as stage:
+            file_path, content_hash, file_size = stream_upload_file(file)
+            stage.bytes += file_size
         
         # Create upload history record
-        transaction_id = str(uuid.uuid4())
         upload_record = UploadHistory(
             user_id=user_id,
             model_id=model_id,
             file_name=file.filename,
             file_path=file_path,
-            file_size=file.size,
-            status="processing",
-            transaction_id=transaction_id
+            file_size=file_size,
+            status="pending",
+            transaction_id=str(uuid.uuid4())
+        )
+        UploadService._update_metadata(upload_record, stages=timer.summary())
+        
+        return UploadService._queue_upload(
+            db,
+            upload_record,
+            data_model,
+            content_hash,
+            column_mapping,
+            mode
+        )
+    
+    @staticmethod
+    def dry_run_upload(
+        db: Session,
+        model_id: int,
+        user_id: int,
+        file: UploadFile = None,
+        upload_token: str = None,
+        column_mapping: Dict[str, str] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a file against a data model without importing it
+        
+        Nothing is written: no upload record is created and the data model
+        table is never opened. A file sent directly is deleted afterwards;
+        a preview session is left in place so it can still be committed.
+        
+        Returns:
+            Full validation statistics with a sample of row errors
+        """
+        data_model = db.query(DataModel).filter(DataModel.id == model_id).first()
+        if not data_model:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Data model not found"
+            )
+        
+        if upload_token:
+            session_record = db.query(UploadHistory).filter(
+                UploadHistory.transaction_id == upload_token,
+                UploadHistory.status == "preview",
+                UploadHistory.user_id == user_id
+            ).first()
+            if not session_record or not os.path.exists(session_record.file_path):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Upload session not found"
+                )
+            file_name, file_path = session_record.file_name, session_record.file_path
+        else:
+            is_valid, error_msg = validate_file(file.filename, file.size)
+            if not is_valid:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=error_msg
+                )
+            file_name = file.filename
+            file_path, _, _ = stream_upload_file(file)
+        
+        # Release the pooled connection while the workers run
+        db.close()
+        
+        start = time.perf_counter()
+        try:
+            validation_results, workers = validate_file_parallel(
+                file_path,
+                data_model.schema_json,
+                data_model.id,
+                data_model.version,
+                column_mapping
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        finally:
+            if not upload_token:
+                os.remove(file_path)
+        
+        return {
+            "file_name": file_name,
+            "model_id": model_id,
+            **validation_results,
+            "workers": workers,
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+    
+    @staticmethod
+    def _check_mode(mode: str) -> None:
+        """Reject unknown ingest modes before any file is stored"""
+        if mode is not None and mode not in INGEST_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid mode. Allowed modes: {', '.join(INGEST_MODES)}"
+            )
+    
+    @staticmethod
+    def _queue_upload(
+        db: Session,
+        upload_record: UploadHistory,
+        data_model: DataModel,
+        content_hash: str,
+        column_mapping: Dict[str, str] = None,
+        mode: str = None
+    ) -> UploadHistory:
+        """Check for a duplicate, save a pending record and hand it to the workers"""
+        
+        registered = UploadService._register_upload(
+            db,
+            upload_record,
+            data_model,
+            content_hash,
+            column_mapping,
+            mode=mode
+        )
+        if registered is not upload_record:
+            return registered
+        
+        # Hand ingestion to the worker pool and return immediately
+        if not submit_upload_job(UploadService.run_upload_job, upload_record.id):
+            UploadService._fail_queued(db, [upload_record])
+            
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Upload queue is full, please retry later"
+            )
+        
+        return upload_record
+    
+    @staticmethod
+    def _fail_queued(db: Session, upload_records: List[UploadHistory]) -> None:
+        """Mark uploads that could not be queued as failed"""
+        for upload_record in upload_records:
+            upload_record.status = "failed"
+            upload_record.error_log = "Upload queue is full"
+            upload_record.completed_at = datetime.utcnow()
+        db.commit()
+    
+    @staticmethod
+    def _register_upload(
+        db: Session,
+        upload_record: UploadHistory,
+        data_model: DataModel,
+        content_hash: str,
+        column_mapping: Dict[str, str] = None,
+        **metadata
+    ) -> UploadHistory:
+        """
+        Save a pending upload record unless its content was already uploaded
+        
+        Returns:
+            The saved record, or the earlier upload when the duplicate
+            policy is "skip"
+        """
+        
+        # Short-circuit repeated uploads of the same content before parsing
+        if settings.DUPLICATE_UPLOAD_POLICY != "allow":
+            duplicate = UploadService._find_duplicate_upload(
+                db,
+                data_model.id,
+                data_model.version,
+                content_hash
+            )
+            if duplicate:
+                os.remove(upload_record.file_path)
+                if upload_record.id is not None:
+                    # A committed preview session is no longer needed
+                    db.delete(upload_record)
+                    db.commit()
+                
+                if settings.DUPLICATE_UPLOAD_POLICY == "reject":
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"File was already uploaded to this data model (upload {duplicate.id})"
+                    )
+                
+                log_audit(
+                    db=db,
+                    user_id=upload_record.user_id,
+                    action="upload",
+                    resource="data",
+                    resource_id=duplicate.id,
+                    details={
+                        "file_name": upload_record.file_name,
+                        "duplicate_of": duplicate.id
+                    }
+                )
+                return duplicate
+        
+        upload_record.content_hash = content_hash
+        UploadService._update_metadata(
+            upload_record,
+            content_hash=content_hash,
+            model_version=data_model.version,
+            column_mapping=column_mapping,
+            **metadata
         )
         
         db.add(upload_record)
         db.commit()
         db.refresh(upload_record)
         
+        return upload_record
+    
+    @staticmethod
+    def upload_batch(
+        db: Session,
+        files: List[UploadFile],
+        user_id: int,
+        model_mapping: Dict[str, int] = None,
+        default_model_id: int = None,
+        column_mappings: Dict[str, Dict[str, str]] = None,
+        mode: str = None
+    ) -> Dict[str, Any]:
+        """
+        Save many files (or the files inside zip archives) and queue them
+        
+        Files of the same data model are processed one after another in
+        the order given, by a single job; different models run in parallel
+        on the upload workers. Each file gets its own upload record and
+        transaction_id, tagged with a shared batch_id.
+        
+        Files inside an archive are named "<archive name>/<path in archive>"
+        in the mappings and upload records; a mapping for the archive name
+        itself applies to all of its files.
+        
+        Args:
+            files: Uploaded files; .zip files are expanded into their members
+            user_id: Uploading user
+            model_mapping: File name -> model_id
+            default_model_id: Model for files missing from model_mapping
+            column_mappings: File name -> column mapping
+            mode: Ingest mode for every file (default: each model's own)
+        
+        Returns:
+            Combined batch summary
+        """
+        UploadService._check_mode(mode)
+        model_mapping = model_mapping or {}
+        column_mappings = column_mappings or {}
+        
+        # Save everything first, so a bad file rejects the batch before any processing
+        entries = []
+        entry_archives = []
+        entry_stages = []
         try:
-            # Process file
-            df, validation_results = process_upload(
-                file_path,
+            for file in files:
+                is_valid, error_msg = validate_file(file.filename, file.size)
+                if not is_valid:
+                    raise ValueError(f"{file.filename}: {error_msg}")
+                
+                timer = StageTimer()
+                with timer.stage("save") as stage:
+                    file_path, content_hash, file_size = stream_upload_file(file)
+                    stage.bytes += file_size
+                
+                if get_file_extension(file.filename) == 'zip':
+                    try:
+                        with timer.stage("extract") as stage:
+                            members = extract_archive(file_path)
+                            stage.bytes += sum(member[3] for member in members)
+                    finally:
+                        os.remove(file_path)
+                    # Members of different archives may share a path, so keep the archive name
+                    entries.extend(
+                        (f"{file.filename}/{member_path}", member_file, content_hash, size)
+                        for member_path, member_file, content_hash, size in members
+                    )
+                    entry_archives.extend(file.filename for _ in members)
+                    # Counted once, on the first member, so per-model totals stay right
+                    entry_stages.extend(
+                        [timer.summary()] + [{} for _ in members[1:]]
+                    )
+                else:
+                    entries.append((file.filename, file_path, content_hash, file_size))
+                    entry_archives.append(None)
+                    entry_stages.append(timer.summary())
+            
+            if not entries:
+                raise ValueError("No files to upload")
+            
+            data_models = {}
+            entry_models = []
+            batch_hashes = {}
+            for (file_name, _, content_hash, _), archive_name in zip(entries, entry_archives):
+                model_id = model_mapping.get(
+                    file_name,
+                    model_mapping.get(archive_name, default_model_id)
+                )
+                entry_models.append(model_id)
+                if model_id is None:
+                    raise ValueError(f"{file_name}: no model_id given")
+                
+                # Files repeated within the batch are not in the history yet
+                earlier = batch_hashes.setdefault((model_id, content_hash), file_name)
+                if earlier != file_name and settings.DUPLICATE_UPLOAD_POLICY == "reject":
+                    raise ValueError(f"{file_name}: same content as {earlier}")
+                
+                if model_id not in data_models:
+                    data_model = db.query(DataModel).filter(DataModel.id == model_id).first()
+                    if not data_model:
+                        raise ValueError(f"{file_name}: data model {model_id} not found")
+                    data_models[model_id] = data_model
+                
+                # Checked before any record is saved, so a rejected batch leaves nothing behind
+                if settings.DUPLICATE_UPLOAD_POLICY == "reject":
+                    duplicate = UploadService._find_duplicate_upload(
+                        db,
+                        model_id,
+                        data_models[model_id].version,
+                        content_hash
+                    )
+                    if duplicate:
+                        raise HTTPException(
+                            status_code=status.HTTP_409_CONFLICT,
+                            detail=f"{file_name}: file was already uploaded to this data model (upload {duplicate.id})"
+                        )
+        except (ValueError, zipfile.BadZipFile, HTTPException) as e:
+            for _, file_path, _, _ in entries:
+                os.remove(file_path)
+            if isinstance(e, HTTPException):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        batch_id = str(uuid.uuid4())
+        uploads = []
+        queued_by_model = {}
+        registered_hashes = {}
+        
+        for position, (file_name, file_path, content_hash, file_size) in enumerate(entries):
+            model_id = entry_models[position]
+            column_mapping = column_mappings.get(
+                file_name,
+                column_mappings.get(entry_archives[position])
+            )
+            
+            key = (model_id, content_hash)
+            if key in registered_hashes and settings.DUPLICATE_UPLOAD_POLICY != "allow":
+                os.remove(file_path)
+                uploads.append(registered_hashes[key])
+                continue
+            
+            upload_record = UploadHistory(
+                user_id=user_id,
+                model_id=model_id,
+                file_name=file_name,
+                file_path=file_path,
+                file_size=file_size,
+                status="pending",
+                transaction_id=str(uuid.uuid4()),
+                batch_id=batch_id
+            )
+            try:
+                registered = UploadService._register_upload(
+                    db,
+                    upload_record,
+                    data_models[model_id],
+                    content_hash,
+                    column_mapping,
+                    mode=mode,
+                    batch_id=batch_id,
+                    batch_position=position,
+                    stages=entry_stages[position]
+                )
+            except HTTPException:
+                # A concurrent upload of the same content: undo the part of the batch already saved
+                UploadService._discard_batch(
+                    db,
+                    [record for records in queued_by_model.values() for record in records],
+                    [entry[1] for entry in entries[position + 1:]]
+                )
+                raise
+            uploads.append(registered)
+            registered_hashes[key] = registered
+            if registered is upload_record:
+                queued_by_model.setdefault(model_id, []).append(upload_record)
+        
+        # One sequential job per model keeps each model's files in order
+        for model_uploads in queued_by_model.values():
+            if not submit_upload_job(
+                UploadService.run_upload_jobs,
+                [upload_record.id for upload_record in model_uploads]
+            ):
+                UploadService._fail_queued(db, model_uploads)
+        
+        log_audit(
+            db=db,
+            user_id=user_id,
+            action="batch_upload",
+            resource="data",
+            details={
+                "batch_id": batch_id,
+                "files": [upload.file_name for upload in uploads]
+            }
+        )
+        
+        return UploadService._summarize_batch(batch_id, uploads)
+    
+    @staticmethod
+    def _discard_batch(db: Session, upload_records: List[UploadHistory], file_paths: List[str]) -> None:
+        """Delete the not yet queued records and saved files of an aborted batch"""
+        for upload_record in upload_records:
+            file_paths.append(upload_record.file_path)
+            db.delete(upload_record)
+        db.commit()
+        
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    
+    @staticmethod
+    def get_batch_summary(db: Session, batch_id: str) -> Dict[str, Any]:
+        """Combined status and counts of the uploads of a batch"""
+        uploads = db.query(UploadHistory).filter(
+            UploadHistory.batch_id == batch_id
+        ).all()
+        if not uploads:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload batch not found"
+            )
+        
+        uploads.sort(key=lambda upload: UploadService._get_metadata(upload).get("batch_position", 0))
+        return UploadService._summarize_batch(batch_id, uploads)
+    
+    @staticmethod
+    def _summarize_batch(batch_id: str, uploads: List[UploadHistory]) -> Dict[str, Any]:
+        """Aggregate the status and record counts of a batch's uploads"""
+        statuses = {upload.status for upload in uploads}
+        if statuses & {"pending", "processing"}:
+            batch_status = "processing"
+        elif statuses == {"completed"}:
+            batch_status = "completed"
+        elif "completed" in statuses:
+            batch_status = "partial"
+        else:
+            batch_status = "failed"
+        
+        return {
+            "batch_id": batch_id,
+            "status": batch_status,
+            "files": len(uploads),
+            "records_count": sum(upload.records_count or 0 for upload in uploads),
+            "records_success": sum(upload.records_success or 0 for upload in uploads),
+            "records_failed": sum(upload.records_failed or 0 for upload in uploads),
+            "uploads": uploads
+        }
+    
+    @staticmethod
+    def run_upload_job(upload_id: int) -> None:
+        """Worker entry point: process a pending upload in its own session"""
+        db = SessionLocal()
+        try:
+            upload_record = db.query(UploadHistory).filter(UploadHistory.id == upload_id).first()
+            if not upload_record:
+                logger.error(f"Upload {upload_id} not found for processing")
+                return
+            
+            UploadService.process_upload_record(db, upload_record)
+        except Exception as e:
+            logger.error(f"Upload {upload_id} failed: {e}")
+        finally:
+            db.close()
+    
+    @staticmethod
+    def run_upload_jobs(upload_ids: List[int]) -> None:
+        """Worker entry point: process uploads one after another, in order"""
+        for upload_id in upload_ids:
+            UploadService.run_upload_job(upload_id)
+    
+    @staticmethod
+    def process_upload_record(db: Session, upload_record: UploadHistory) -> UploadHistory:
+        """Parse, validate and insert the file of an upload record"""
+        
+        data_model = db.query(DataModel).filter(DataModel.id == upload_record.model_id).first()
+        metadata = UploadService._get_metadata(upload_record)
+        column_mapping = metadata.get("column_mapping")
+        checkpoint = metadata.get("checkpoint") or {}
+        # Resumed uploads keep adding to the stages of earlier attempts
+        timer = StageTimer(metadata.get("stages"))
+        
+        upload_record.status = "processing"
+        UploadService._update_metadata(
+            upload_record,
+            progress={"updated_at": datetime.utcnow().isoformat()}
+        )
+        db.commit()
+        
+        try:
+            if not data_model:
+                raise ValueError("Data model not found")
+            
+            DataModelService.ensure_transaction_column(db, data_model.table_name)
+            
+            sizer = BatchSizer(
                 data_model.schema_json,
-                column_mapping
+                get_max_packet_bytes(db),
+                data_model.ingest_config
             )
             
-            # Insert data into table
-            if len(df) > 0:
-                UploadService._insert_data(
+            ingest_config = data_model.ingest_config or {}
+            mode = metadata.get("mode") or ingest_config.get("mode", "append")
+            merge_key = UploadService._merge_key(db, data_model) if mode == "merge" else None
+            
+            delta = None
+            if mode == "delta":
+                with timer.stage("delta"):
+                    ensure_row_hash_column(db, data_model.table_name, data_model.schema_json)
+                    delta = DeltaFilter(db, data_model.table_name, data_model.schema_json)
+                # Rows committed before an interruption now match their own
+                # hashes, so a delta upload simply restarts from the top
+                checkpoint = {}
+            
+            partition_config = ingest_config.get("partitioning")
+            
+            # Continue after the last checkpoint, dropping rows committed past it
+            validation_results = new_validation_results()
+            if checkpoint:
+                UploadService._delete_transaction_rows(
                     db,
                     data_model.table_name,
-                    df,
-                    transaction_id
+                    upload_record.transaction_id,
+                    after_id=checkpoint.get("max_id")
+                )
+                db.commit()
+                for key in ("total_rows", "valid_rows", "invalid_rows"):
+                    validation_results[key] = checkpoint.get(key, 0)
+                # Rows before the checkpoint are not validated again, so neither are their errors
+                validation_results['constraint_violations'] = checkpoint.get("constraint_violations", {})
+                validation_results['errors'] = checkpoint.get("errors", [])
+            
+            # Rows rejected past the checkpoint will be rejected again
+            db.query(UploadRejectedRow).filter(
+                UploadRejectedRow.upload_id == upload_record.id,
+                UploadRejectedRow.row_number >= checkpoint.get("source_rows", 0)
+            ).delete(synchronize_session=False)
+            db.commit()
+            
+            def quarantine(rejected: pd.DataFrame, reasons: List[List[Dict[str, str]]]) -> None:
+                with timer.stage("quarantine") as stage:
+                    stage.rows += UploadService._quarantine_rows(
+                        db,
+                        upload_record.id,
+                        rejected,
+                        reasons
+                    )
+            
+            # Stream file chunk by chunk and insert each one as it is validated
+            chunks_processed = 0
+            for chunk in process_upload_chunks(
+                upload_record.file_path,
+                data_model.schema_json,
+                validation_results,
+                column_mapping,
+                checks=get_compiled_constraints(
+                    data_model.id,
+                    data_model.version,
+                    data_model.schema_json
+                ),
+                skip_rows=checkpoint.get("source_rows", 0),
+                timer=timer,
+                on_rejected=quarantine
+            ):
+                if delta is not None:
+                    with timer.stage("delta") as stage:
+                        stage.rows += len(chunk)
+                        chunk = delta.filter(chunk)
+                
+                if len(chunk) > 0 and partition_config and partition_config["strategy"] == "date":
+                    with timer.stage("partition"):
+                        partitioning.ensure_date_partitions(
+                            db,
+                            data_model.table_name,
+                            partition_config,
+                            chunk[partition_config["field"]]
+                        )
+                
+                if len(chunk) > 0:
+                    with timer.stage("insert") as stage:
+                        UploadService._insert_data(
+                            db,
+                            data_model.table_name,
+                            chunk,
+                            upload_record.transaction_id,
+                            sizer=sizer,
+                            merge_key=merge_key,
+                            upload_id=upload_record.id
+                        )
+                        stage.rows += len(chunk)
+                        stage.bytes += frame_bytes(chunk)
+                
+                # Report progress for status polling and checkpoint for resume
+                chunks_processed += 1
+                upload_record.records_count = validation_results['total_rows']
+                UploadService._update_metadata(
+                    upload_record,
+                    progress={
+                        "rows_processed": validation_results['total_rows'],
+                        "chunks_processed": chunks_processed,
+                        "updated_at": datetime.utcnow().isoformat()
+                    },
+                    checkpoint={
+                        "source_rows": validation_results['total_rows'],
+                        "max_id": UploadService._max_row_id(db, data_model.table_name),
+                        "total_rows": validation_results['total_rows'],
+                        "valid_rows": validation_results['valid_rows'],
+                        "invalid_rows": validation_results['invalid_rows'],
+                        "constraint_violations": validation_results['constraint_violations'],
+                        "errors": validation_results['errors']
+                    },
+                    batching=sizer.summary(),
+                    stages=timer.summary(),
+                    compaction=validation_results.get('compaction')
+                )
+                db.commit()
+            
+            if delta is not None:
+                tombstoned = 0
+                if ingest_config.get("delta_tombstones", False):
+                    with timer.stage("tombstone") as stage:
+                        tombstoned = delta.tombstone_missing(
+                            db,
+                            data_model.table_name,
+                            upload_record.id
+                        )
+                        stage.rows += tombstoned
+                UploadService._update_metadata(
+                    upload_record,
+                    delta={**delta.summary(), "rows_tombstoned": tombstoned}
                 )
+                db.commit()
             
             # Update upload record
             upload_record.status = "completed"
@@ -97,86 +913,535 @@ class UploadService:
             upload_record.records_failed = validation_results['invalid_rows']
             upload_record.completed_at = datetime.utcnow()
             
-            if validation_results['errors']:
-                upload_record.error_log = str(validation_results['errors'])
+            upload_record.error_log = UploadService._error_summary(
+                upload_record.id,
+                validation_results
+            )
             
+            UploadService._update_metadata(
+                upload_record,
+                stages=timer.summary(),
+                rejected={
+                    "rows": validation_results['invalid_rows'],
+                    "violations": validation_results['constraint_violations'],
+                    "errors": validation_results['errors']
+                }
+            )
             db.commit()
             db.refresh(upload_record)
             
             # Log audit
             log_audit(
                 db=db,
-                user_id=user_id,
+                user_id=upload_record.user_id,
                 action="upload",
                 resource="data",
                 resource_id=upload_record.id,
                 details={
-                    "file_name": file.filename,
+                    "file_name": upload_record.file_name,
                     "model_name": data_model.name,
                     "records": validation_results['total_rows']
                 }
             )
-            
+        
         except Exception as e:
+            db.rollback()
+            
+            # Chunks commit as they go, so compensate like a rollback would
+            deleted_count = 0
+            if data_model:
+                try:
+                    deleted_count = UploadService._revert_upload_rows(
+                        db,
+                        data_model,
+                        upload_record
+                    )
+                    UploadService._update_metadata(upload_record, checkpoint=None)
+                    db.commit()
+                except Exception as cleanup_error:
+                    db.rollback()
+                    logger.error(
+                        f"Failed to remove rows of upload {upload_record.id}: {cleanup_error}"
+                    )
+            
             # Update status to failed
             upload_record.status = "failed"
             upload_record.error_log = str(e)
             upload_record.completed_at = datetime.utcnow()
+            UploadService._update_metadata(upload_record, stages=timer.summary())
             db.commit()
             
             # Log audit
             log_audit(
                 db=db,
-                user_id=user_id,
+                user_id=upload_record.user_id,
                 action="upload",
                 resource="data",
                 resource_id=upload_record.id,
                 details={
-                    "file_name": file.filename,
-                    "error": str(e)
+                    "file_name": upload_record.file_name,
+                    "error": str(e),
+                    "records_deleted": deleted_count
                 },
                 status="failed"
             )
             
+            raise
+        
+        return upload_record
+    
+    @staticmethod
+    def _quarantine_rows(
+        db: Session,
+        upload_id: int,
+        rejected: pd.DataFrame,
+        reasons: List[List[Dict[str, str]]]
+    ) -> int:
+        """Bulk-write the invalid rows of a chunk to upload_rejected_rows; the caller commits"""
+        data = json.loads(rejected.to_json(orient="records", date_format="iso"))
+        db.execute(insert(UploadRejectedRow), [
+            {
+                "upload_id": upload_id,
+                "row_number": int(row_number),
+                "data": row_data,
+                "errors": row_reasons
+            }
+            for row_number, row_data, row_reasons in zip(rejected.index, data, reasons)
+        ])
+        return len(data)
+    
+    @staticmethod
+    def _error_summary(upload_id: int, validation_results: Dict[str, Any]) -> Optional[str]:
+        """Short error_log text; the rejected rows themselves are in upload_rejected_rows"""
+        parts = [
+            f"{error['field']}: {error['error']}" for error in validation_results['errors']
+        ]
+        
+        if validation_results['invalid_rows']:
+            counts = ", ".join(
+                f"{field} {rule} {count}"
+                for field, rules in validation_results['constraint_violations'].items()
+                for rule, count in rules.items()
+            )
+            parts.append(
+                f"{validation_results['invalid_rows']} rows rejected ({counts}), "
+                f"see GET /uploads/{upload_id}/rejected"
+            )
+        
+        return "; ".join(parts) or None
+    
+    @staticmethod
+    def get_rejected_rows(
+        db: Session,
+        upload_id: int,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Page through the rows of an upload that failed validation
+        
+        Args:
+            upload_id: Upload ID
+            limit: Rows per page
+            offset: Rows to skip
+        
+        Returns:
+            Rows with their values and reasons, plus the total count
+        """
+        upload = db.query(UploadHistory).filter(UploadHistory.id == upload_id).first()
+        if not upload:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Upload failed: {str(e)}"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
             )
         
-        return upload_record
+        query = db.query(UploadRejectedRow).filter(UploadRejectedRow.upload_id == upload_id)
+        rows = query.order_by(UploadRejectedRow.id).offset(offset).limit(limit).all()
+        
+        return {
+            "upload_id": upload_id,
+            "rows": rows,
+            "total": query.count(),
+            "limit": limit,
+            "offset": offset
+        }
+    
+    @staticmethod
+    def _get_metadata(upload: UploadHistory) -> Dict[str, Any]:
+        """Parse the JSON metadata stored on an upload record"""
+        if not upload.metadata_json:
+            return {}
+        try:
+            return json.loads(upload.metadata_json)
+        except ValueError:
+            return {}
+    
+    @staticmethod
+    def _update_metadata(upload: UploadHistory, **values) -> None:
+        """Merge values into the JSON metadata of an upload record"""
+        metadata = UploadService._get_metadata(upload)
+        metadata.update(values)
+        upload.metadata_json = json.dumps(metadata, default=str)
+    
+    @staticmethod
+    def _find_duplicate_upload(
+        db: Session,
+        model_id: int,
+        model_version: int,
+        content_hash: str
+    ) -> UploadHistory:
+        """Find a completed upload of the same content to the same model version"""
+        # Looked up through the content_hash index; only the few uploads of the same file are read
+        candidates = db.query(UploadHistory).filter(
+            UploadHistory.content_hash == content_hash,
+            UploadHistory.model_id == model_id,
+            UploadHistory.status == "completed"
+        ).order_by(UploadHistory.created_at.desc()).all()
+        
+        for candidate in candidates:
+            if UploadService._get_metadata(candidate).get("model_version") == model_version:
+                return candidate
+        
+        return None
     
     @staticmethod
     def _insert_data(
         db: Session,
         table_name: str,
         df: pd.DataFrame,
-        transaction_id: str
+        transaction_id: str,
+        strategy: str = None,
+        sizer: BatchSizer = None,
+        merge_key: str = None,
+        upload_id: int = None
     ) -> None:
-        """Insert DataFrame data into table"""
+        """Insert DataFrame data into table using the dialect's bulk loader, or upsert on merge_key"""
+        
+        # Tag every row with transaction_id for rollback capability
+        columns = list(df.columns) + ['transaction_id']
+        
+        # Insert in lazily built batches, sized by the sizer
+        if sizer is None:
+            sizer = BatchSizer()
+        sizer.observe_frame(df)
+        batches = iter_row_batches(
+            df,
+            sizer.next_size,
+            constants={'transaction_id': transaction_id}
+        )
+        
+        if merge_key:
+            strategy = "merge"
+            loader = partial(
+                merge_load,
+                key_column=merge_key,
+                transaction_id=transaction_id,
+                upload_id=upload_id
+            )
+        else:
+            strategy = strategy or select_loader(db.get_bind())
+            loader = LOADERS[strategy]
         
-        # Add transaction_id column for rollback capability
-        df['transaction_id'] = transaction_id
+        if strategy in SINGLE_STATEMENT_LOADERS:
+            # Batches only fill the load file; the one statement is timed as a whole
+            rows = len(df)
+            start = time.perf_counter()
+            loader(db, table_name, columns, batches)
+            db.commit()
+            sizer.record(rows, time.perf_counter() - start, tune=False)
+            return
+        
+        if settings.UPLOAD_PARALLEL_CONNECTIONS > 1:
+            UploadService._insert_batches_parallel(
+                loader,
+                table_name,
+                columns,
+                batches,
+                settings.UPLOAD_PARALLEL_CONNECTIONS,
+                sizer
+            )
+            return
+        
+        # Each batch is its own call, so only the statement is timed
+        for batch in batches:
+            sizer.execute(batch, lambda rows: loader(db, table_name, columns, [rows]))
+        
+        db.commit()
+    
+    @staticmethod
+    def _insert_batches_parallel(
+        loader: Loader,
+        table_name: str,
+        columns: List[str],
+        batches: Iterable[List[Tuple]],
+        connections: int,
+        sizer: BatchSizer
+    ) -> None:
+        """
+        Spread batches across pooled connections, one session per batch
         
-        # Convert DataFrame to list of dicts
-        records = df.to_dict(orient='records')
+        Each batch commits on its own connection and is timed there, so
+        the sizer sees statement latency, not time spent queueing. If any
+        batch fails the error is raised after in-flight batches finish, and
+        the caller removes the committed rows by transaction_id.
+        """
         
-        # Insert in batches
-        batch_size = 1000
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
+        def load_batch(batch: List[Tuple]) -> None:
+            session = SessionLocal()
+            
+            def write(rows: List[Tuple]) -> None:
+                loader(session, table_name, columns, [rows])
+                session.commit()
             
-            # Build insert query
-            columns = list(batch[0].keys())
-            placeholders = ', '.join([f':{col}' for col in columns])
-            query = text(
-                f"INSERT INTO {table_name} ({', '.join(columns)}) "
-                f"VALUES ({placeholders})"
+            try:
+                sizer.execute(batch, write)
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+        
+        # Keep a bounded number of batches in flight to cap memory
+        max_in_flight = connections * 2
+        in_flight = deque()
+        
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            try:
+                for batch in batches:
+                    if len(in_flight) >= max_in_flight:
+                        in_flight.popleft().result()
+                    in_flight.append(pool.submit(load_batch, batch))
+                
+                while in_flight:
+                    in_flight.popleft().result()
+            except Exception:
+                for future in in_flight:
+                    future.cancel()
+                raise
+    
+    @staticmethod
+    def _delete_transaction_rows(
+        db: Session,
+        table_name: str,
+        transaction_id: str,
+        after_id: int = None,
+        on_progress: Callable[[int], None] = None
+    ) -> int:
+        """
+        Delete the rows an upload inserted, optionally only those above after_id
+        
+        Rows are deleted through the transaction_id index in chunks of
+        ROLLBACK_CHUNK_SIZE, committing after each one, so no single
+        statement holds row locks for long and dashboard reads keep going.
+        
+        Args:
+            on_progress: Called with the running total after each chunk
+        
+        Returns:
+            Number of rows deleted
+        """
+        chunk_size = settings.ROLLBACK_CHUNK_SIZE
+        params = {"transaction_id": transaction_id, "chunk_size": chunk_size}
+        condition = "transaction_id = :transaction_id"
+        if after_id is not None:
+            condition += " AND id > :after_id"
+            params["after_id"] = after_id
+        
+        if db.get_bind().dialect.name == "mysql":
+            query = f"DELETE FROM {table_name} WHERE {condition} LIMIT :chunk_size"
+        else:
+            query = (
+                f"DELETE FROM {table_name} WHERE id IN "
+                f"(SELECT id FROM {table_name} WHERE {condition} LIMIT :chunk_size)"
             )
+        
+        total = 0
+        while True:
+            deleted = db.execute(text(query), params).rowcount
+            db.commit()
+            total += deleted
+            if on_progress:
+                on_progress(total)
+            if deleted < chunk_size:
+                break
+        
+        return total
+    
+    @staticmethod
+    def _merge_key(db: Session, data_model: DataModel) -> str:
+        """
+        Unique column merge uploads are matched on
+        
+        MySQL's ON DUPLICATE KEY UPDATE fires on any unique key, but the
+        rows a merge replaces are only recorded by the merge key. So the
+        table must have exactly one single-column unique key besides the
+        primary key, and it must be the merge key; otherwise a row
+        overwritten through another key could not be restored on rollback.
+        """
+        inspector = inspect(db.get_bind())
+        table_name = data_model.table_name
+        unique_keys = {
+            tuple(constraint['column_names'])
+            for constraint in inspector.get_unique_constraints(table_name)
+        }
+        unique_keys.update(
+            tuple(index['column_names'])
+            for index in inspector.get_indexes(table_name)
+            if index.get('unique')
+        )
+        
+        if not unique_keys:
+            raise ValueError("Merge mode requires a unique field in the data model")
+        if len(unique_keys) > 1 or len(next(iter(unique_keys))) > 1:
+            raise ValueError(
+                "Merge mode requires exactly one single-column unique key, "
+                f"found: {', '.join('(' + ', '.join(key) + ')' for key in sorted(unique_keys))}"
+            )
+        
+        unique_column = next(iter(unique_keys))[0]
+        merge_key = (data_model.ingest_config or {}).get("merge_key", unique_column)
+        if merge_key != unique_column:
+            raise ValueError(
+                f"merge_key {merge_key} has no unique index; merge uploads match on {unique_column}"
+            )
+        return merge_key
+    
+    @staticmethod
+    def _revert_upload_rows(
+        db: Session,
+        data_model: DataModel,
+        upload: UploadHistory,
+        on_progress: Callable[[int], None] = None
+    ) -> int:
+        """Delete an upload's rows and restore the rows it merged over; the caller commits the restore"""
+        # On tables partitioned by upload the deletes are pruned to one partition
+        deleted_count = UploadService._delete_transaction_rows(
+            db,
+            data_model.table_name,
+            upload.transaction_id,
+            on_progress=on_progress
+        )
+        UploadService._restore_replaced_rows(db, data_model.table_name, upload.id)
+        return deleted_count
+    
+    @staticmethod
+    def _restore_replaced_rows(db: Session, table_name: str, upload_id: int) -> int:
+        """
+        Re-insert the previous values of rows a merge upload overwrote
+        
+        Rows that still exist were changed again by a later upload and
+        are left as they are. Recorded values are removed once restored.
+        The caller commits.
+        """
+        restored = 0
+        last_id = 0
+        
+        while True:
+            page = db.query(UploadReplacedRow).filter(
+                UploadReplacedRow.upload_id == upload_id,
+                UploadReplacedRow.id > last_id
+            ).order_by(UploadReplacedRow.id).limit(RESTORE_PAGE_SIZE).all()
+            if not page:
+                break
+            last_id = page[-1].id
+            
+            existing = set(db.execute(
+                text(f"SELECT id FROM {table_name} WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ),
+                {"ids": [replaced.row_id for replaced in page]}
+            ).scalars())
+            rows = [replaced.data for replaced in page if replaced.row_id not in existing]
             
-            # Execute batch insert
-            db.execute(query, batch)
+            if rows:
+                columns = list(rows[0].keys())
+                db.execute(
+                    text(
+                        f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(f':{col}' for col in columns)})"
+                    ),
+                    rows
+                )
+                restored += len(rows)
+        
+        db.query(UploadReplacedRow).filter(
+            UploadReplacedRow.upload_id == upload_id
+        ).delete(synchronize_session=False)
+        
+        return restored
+    
+    @staticmethod
+    def _max_row_id(db: Session, table_name: str) -> int:
+        """Highest primary key in a data table, read from the PK index"""
+        return db.execute(text(f"SELECT MAX(id) FROM {table_name}")).scalar()
+    
+    @staticmethod
+    def resume_upload(
+        db: Session,
+        upload_id: int,
+        user_id: int
+    ) -> UploadHistory:
+        """Queue an interrupted upload to continue from its last checkpoint"""
+        
+        upload = db.query(UploadHistory).filter(UploadHistory.id == upload_id).first()
+        if not upload:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        
+        if upload.status not in ("pending", "processing"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Can only resume pending or processing uploads"
+            )
+        
+        # A live worker refreshes the heartbeat after every chunk
+        heartbeat = UploadService._get_metadata(upload).get("progress", {}).get("updated_at")
+        last_seen = datetime.fromisoformat(heartbeat) if heartbeat else upload.created_at
+        if (datetime.utcnow() - last_seen).total_seconds() < settings.UPLOAD_STALE_SECONDS:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload is still being processed"
+            )
         
+        if not upload.file_path or not os.path.exists(upload.file_path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded file is no longer available"
+            )
+        
+        # Refresh the heartbeat so a second resume request is refused
+        upload.status = "pending"
+        UploadService._update_metadata(
+            upload,
+            progress={
+                **UploadService._get_metadata(upload).get("progress", {}),
+                "updated_at": datetime.utcnow().isoformat()
+            }
+        )
         db.commit()
+        db.refresh(upload)
+        
+        if not submit_upload_job(UploadService.run_upload_job, upload.id):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Upload queue is full, please retry later"
+            )
+        
+        log_audit(
+            db=db,
+            user_id=user_id,
+            action="resume",
+            resource="upload",
+            resource_id=upload.id,
+            details={
+                "file_name": upload.file_name,
+                "checkpoint": UploadService._get_metadata(upload).get("checkpoint")
+            }
+        )
+        
+        return upload
     
     @staticmethod
     def get_upload_history(
@@ -193,15 +1458,55 @@ class UploadService:
         if model_id:
             query = query.filter(UploadHistory.model_id == model_id)
         
+        # Uncommitted preview sessions are not uploads yet
+        query = query.filter(UploadHistory.status != "preview")
+        
         return query.order_by(UploadHistory.created_at.desc()).limit(limit).all()
     
+    @staticmethod
+    def get_model_upload_stats(
+        db: Session,
+        model_id: int,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Stage timings aggregated over a data model's recent completed uploads
+        
+        Args:
+            model_id: Data model ID
+            limit: Most recent uploads to include
+        
+        Returns:
+            Number of uploads, their time span and per-stage aggregates
+        """
+        uploads = db.query(UploadHistory).filter(
+            UploadHistory.model_id == model_id,
+            UploadHistory.status == "completed"
+        ).order_by(UploadHistory.created_at.desc()).limit(limit).all()
+        
+        return {
+            "model_id": model_id,
+            "uploads": len(uploads),
+            "since": uploads[-1].created_at if uploads else None,
+            "until": uploads[0].created_at if uploads else None,
+            "stages": aggregate_stages([
+                UploadService._get_metadata(upload).get("stages") for upload in uploads
+            ])
+        }
+    
     @staticmethod
     def rollback_upload(
         db: Session,
         upload_id: int,
         user_id: int
     ) -> UploadHistory:
-        """Rollback an upload by deleting its data"""
+        """
+        Queue the rollback of an upload
+        
+        The upload is marked "reverting" and its rows are deleted in the
+        background; poll GET /uploads/{upload_id} for metadata.rollback
+        progress. A rollback interrupted part way can be requested again.
+        """
         
         upload = db.query(UploadHistory).filter(UploadHistory.id == upload_id).first()
         if not upload:
@@ -210,7 +1515,7 @@ class UploadService:
                 detail="Upload not found"
             )
         
-        if upload.status != "completed":
+        if upload.status not in ("completed", "reverting"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can only rollback completed uploads"
@@ -224,38 +1529,91 @@ class UploadService:
                 detail="Associated data model not found"
             )
         
-        try:
-            # Delete data with matching transaction_id
-            delete_query = text(
-                f"DELETE FROM {data_model.table_name} "
-                f"WHERE transaction_id = :transaction_id"
-            )
-            result = db.execute(delete_query, {"transaction_id": upload.transaction_id})
-            deleted_count = result.rowcount
-            
-            # Update upload status
-            upload.status = "reverted"
+        previous_status = upload.status
+        upload.status = "reverting"
+        UploadService._update_metadata(
+            upload,
+            rollback={"rows_deleted": 0, "updated_at": datetime.utcnow().isoformat()}
+        )
+        db.commit()
+        db.refresh(upload)
+        
+        if not submit_upload_job(UploadService.run_rollback_job, upload.id, user_id):
+            upload.status = previous_status
             db.commit()
-            db.refresh(upload)
-            
-            # Log audit
-            log_audit(
-                db=db,
-                user_id=user_id,
-                action="rollback",
-                resource="upload",
-                resource_id=upload.id,
-                details={
-                    "file_name": upload.file_name,
-                    "records_deleted": deleted_count
-                }
-            )
-            
-        except Exception as e:
-            db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Rollback failed: {str(e)}"
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Upload queue is full, please retry later"
             )
         
-        return upload
\ No newline at end of file
+        return upload
+    
+    @staticmethod
+    def run_rollback_job(upload_id: int, user_id: int) -> None:
+        """Worker entry point: delete an upload's rows in chunks, reporting progress"""
+        db = SessionLocal()
+        try:
+            upload = db.query(UploadHistory).filter(UploadHistory.id == upload_id).first()
+            data_model = db.query(DataModel).filter(DataModel.id == upload.model_id).first()
+            DataModelService.ensure_transaction_column(db, data_model.table_name)
+            
+            def report(rows_deleted: int) -> None:
+                UploadService._update_metadata(
+                    upload,
+                    rollback={
+                        "rows_deleted": rows_deleted,
+                        "updated_at": datetime.utcnow().isoformat()
+                    }
+                )
+                db.commit()
+            
+            try:
+                # Delete data with matching transaction_id, restoring merged-over rows
+                deleted_count = UploadService._revert_upload_rows(
+                    db,
+                    data_model,
+                    upload,
+                    on_progress=report
+                )
+                
+                # Update upload status
+                upload.status = "reverted"
+                db.commit()
+                
+                # Log audit
+                log_audit(
+                    db=db,
+                    user_id=user_id,
+                    action="rollback",
+                    resource="upload",
+                    resource_id=upload.id,
+                    details={
+                        "file_name": upload.file_name,
+                        "records_deleted": deleted_count
+                    }
+                )
+            
+            except Exception as e:
+                # Stays "reverting" so the rollback can be requested again
+                db.rollback()
+                logger.error(f"Rollback of upload {upload_id} failed: {e}")
+                UploadService._update_metadata(
+                    upload,
+                    rollback={
+                        **UploadService._get_metadata(upload).get("rollback", {}),
+                        "error": str(e)
+                    }
+                )
+                db.commit()
+                
+                log_audit(
+                    db=db,
+                    user_id=user_id,
+                    action="rollback",
+                    resource="upload",
+                    resource_id=upload.id,
+                    details={"file_name": upload.file_name, "error": str(e)},
+                    status="failed"
+                )
+        finally:
+            db.close()
\ No newline at end of file
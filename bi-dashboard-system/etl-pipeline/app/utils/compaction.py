@@ -0,0 +1,112 @@
+"""
+DataFrame Compaction Utilities
+etl-pipeline/app/utils/compaction.py
+"""
+from typing import Dict, Any, Optional
+import functools
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+# Nullable integer dtypes from narrowest to widest
+NULLABLE_INTEGER_DTYPES = ("Int8", "Int16", "Int32", "Int64")
+
+
+@functools.lru_cache(maxsize=1)
+def _arrow_string_dtype() -> Optional[pd.StringDtype]:
+    """string[pyarrow] if pyarrow can be imported, otherwise None"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype("pyarrow")
+
+
+def _compact_integers(series: pd.Series) -> pd.Series:
+    """Smallest integer dtype holding the values; missing values need a nullable one"""
+    if not series.isna().any():
+        return pd.to_numeric(series, downcast='integer')
+    
+    present = series.dropna()
+    low, high = present.min(), present.max()
+    for dtype in NULLABLE_INTEGER_DTYPES:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+def _narrowest(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    
+    if pd.api.types.is_integer_dtype(series):
+        return _compact_integers(series)
+    
+    if pd.api.types.is_float_dtype(series):
+        # Whole numbers only: narrowing real floats would change inserted values
+        present = series.dropna()
+        if len(present) and np.isfinite(present).all() and (present % 1 == 0).all():
+            return _compact_integers(series)
+        return series
+    
+    if pd.api.types.is_object_dtype(series):
+        present = series.dropna()
+        if not len(present) or not present.map(type).eq(str).all():
+            return series
+        if present.nunique() <= len(series) * settings.COMPACT_CATEGORY_RATIO:
+            return series.astype('category')
+        string_dtype = _arrow_string_dtype()
+        if string_dtype is not None:
+            return series.astype(string_dtype)
+    
+    return series
+
+
+def compact_column(series: pd.Series, sizes: Dict[str, int] = None) -> pd.Series:
+    """
+    Store a converted column in the narrowest dtype that keeps its values
+    
+    Low-cardinality strings become categoricals, other strings
+    string[pyarrow] when pyarrow is available, and whole-number columns
+    the smallest (nullable) integer type. Values read back for insertion
+    are unchanged.
+    
+    Args:
+        series: Type-converted column
+        sizes: When given, the column's deep memory size before and after
+            is added to its "bytes_before" and "bytes_after"; this walks
+            every string, so callers measure a sample rather than every chunk
+    
+    Returns:
+        Compacted column, or series itself if no narrower dtype fits
+    """
+    compacted = _narrowest(series)
+    if sizes is not None:
+        sizes["bytes_before"] = sizes.get("bytes_before", 0) + int(series.memory_usage(index=False, deep=True))
+        sizes["bytes_after"] = sizes.get("bytes_after", 0) + int(compacted.memory_usage(index=False, deep=True))
+    return compacted
+
+
+def compaction_summary(df: pd.DataFrame, sizes: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Memory report of one compacted chunk for the upload metadata
+    
+    Args:
+        df: The chunk after compaction
+        sizes: Sizes accumulated by compact_column() over its columns
+    
+    Returns:
+        Dictionary of rows, bytes before and after, their ratio and the
+        resulting dtypes
+    """
+    before, after = sizes.get("bytes_before", 0), sizes.get("bytes_after", 0)
+    return {
+        "sampled_rows": len(df),
+        "bytes_before": before,
+        "bytes_after": after,
+        "ratio": round(after / before, 4) if before else None,
+        "dtypes": {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+    }
@@ -0,0 +1,318 @@
+"""
+Constraint Validation Utilities
+etl-pipeline/app/utils/constraints.py
+"""
+from typing import Dict, Any, List, Tuple, Callable, NamedTuple
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+
+class ConstraintCheck(NamedTuple):
+    """A compiled rule: test(series) returns True where a non-null value violates it"""
+    field: str
+    rule: str
+    message: str
+    test: Callable[[pd.Series], np.ndarray]
+
+
+# Compiled checks per (model_id, version); schemas only change with the version
+_compiled_cache: Dict[Tuple[int, int], List[ConstraintCheck]] = {}
+_cache_lock = threading.Lock()
+
+
+def _bound(value: Any, field_type: str) -> Any:
+    """Parse a min/max bound into the same type the column is converted to"""
+    if field_type in ('date', 'datetime'):
+        return pd.Timestamp(value)
+    return float(value)
+
+
+def _comparable(series: pd.Series, field_type: str) -> pd.Series:
+    """Series in a type its min/max bounds can be compared against"""
+    if field_type in ('date', 'datetime'):
+        return pd.to_datetime(series, errors='coerce')
+    return pd.to_numeric(series, errors='coerce')
+
+
+def unique_hashes(series: pd.Series, field_type: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit hashes of a column's values, for uniqueness checks across chunks
+    
+    Values are put in one canonical type per schema field type first: the
+    same column can be int64 in one chunk and float64 (or text) in another,
+    and pandas hashes 1 and 1.0 differently.
+    
+    Args:
+        series: Column of a chunk
+        field_type: Schema type of the field
+    
+    Returns:
+        Tuple of (positions of present values, their uint64 hashes)
+    """
+    if field_type in ('number', 'integer'):
+        values = pd.to_numeric(series, errors='coerce').astype('float64')
+    elif field_type in ('date', 'datetime'):
+        values = pd.to_datetime(series, errors='coerce')
+    else:
+        values = series.astype(str)
+        if pd.api.types.is_float_dtype(series):
+            # Whole numbers read as float because of blanks hash like "1", not "1.0"
+            whole = series % 1 == 0
+            values[whole] = series[whole].astype('int64').astype(str)
+        values = values.where(series.notna(), None)
+    
+    present = np.flatnonzero(values.notna().to_numpy())
+    hashes = pd.util.hash_pandas_object(values.iloc[present], index=False).to_numpy()
+    return present, hashes
+
+
+class SeenHashes:
+    """
+    Set of 64-bit hashes with vectorised membership tests
+    
+    Hashes are kept as sorted runs that are merged whenever a run grows to
+    the size of the one before it, so there are O(log n) runs and adding
+    n hashes costs O(n log n) in total. Merging every chunk into one
+    array would cost a full copy per chunk.
+    """
+    
+    def __init__(self, hashes: np.ndarray = None):
+        self._runs = []
+        if hashes is not None:
+            self.add(hashes)
+    
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """True for each hash already in the set"""
+        # Sorted queries make searchsorted walk each run once, in order
+        order = np.argsort(hashes)
+        queries = hashes[order]
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, queries), len(run) - 1)
+            found[order] |= run[positions] == queries
+        return found
+    
+    def add(self, hashes: np.ndarray) -> None:
+        """Add hashes (repeats are ignored)"""
+        run = np.unique(hashes)
+        if not len(run):
+            return
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.union1d(self._runs.pop(), run)
+        self._runs.append(run)
+
+
+def compile_constraints(schema: List[Dict[str, Any]]) -> List[ConstraintCheck]:
+    """
+    Compile FieldDefinition constraints into vectorised checks
+    
+    Supported constraint keys: min, max, min_length, max_length,
+    pattern (regex matched from the start of the value) and enum
+    (list of allowed values). Required fields are checked for nulls.
+    
+    Args:
+        schema: Data model schema (list of field definitions)
+    
+    Returns:
+        List of compiled checks
+    """
+    checks = []
+    
+    for field in schema:
+        name = field['name']
+        field_type = field.get('type', 'string')
+        constraints = field.get('constraints') or {}
+        
+        if field.get('required', False):
+            checks.append(ConstraintCheck(
+                name, 'required', "Required value missing",
+                lambda s: s.isna().to_numpy()
+            ))
+        
+        if constraints.get('min') is not None:
+            low = _bound(constraints['min'], field_type)
+            checks.append(ConstraintCheck(
+                name, 'min', f"Value below minimum {constraints['min']}",
+                lambda s, low=low, t=field_type: (_comparable(s, t) < low).to_numpy()
+            ))
+        
+        if constraints.get('max') is not None:
+            high = _bound(constraints['max'], field_type)
+            checks.append(ConstraintCheck(
+                name, 'max', f"Value above maximum {constraints['max']}",
+                lambda s, high=high, t=field_type: (_comparable(s, t) > high).to_numpy()
+            ))
+        
+        if constraints.get('min_length') is not None:
+            min_length = int(constraints['min_length'])
+            checks.append(ConstraintCheck(
+                name, 'min_length', f"Shorter than {min_length} characters",
+                lambda s, n=min_length: (s.astype(str).str.len() < n).to_numpy()
+            ))
+        
+        if constraints.get('max_length') is not None:
+            max_length = int(constraints['max_length'])
+            checks.append(ConstraintCheck(
+                name, 'max_length', f"Longer than {max_length} characters",
+                lambda s, n=max_length: (s.astype(str).str.len() > n).to_numpy()
+            ))
+        
+        if constraints.get('pattern'):
+            pattern = re.compile(constraints['pattern'])
+            checks.append(ConstraintCheck(
+                name, 'pattern', f"Does not match pattern {constraints['pattern']}",
+                lambda s, p=pattern: ~s.astype(str).str.match(p).to_numpy(dtype=bool)
+            ))
+        
+        if constraints.get('enum'):
+            allowed = list(constraints['enum'])
+            checks.append(ConstraintCheck(
+                name, 'enum', "Value not in allowed list",
+                lambda s, allowed=allowed: ~s.isin(allowed).to_numpy()
+            ))
+    
+    return checks
+
+
+def get_compiled_constraints(
+    model_id: int,
+    version: int,
+    schema: List[Dict[str, Any]]
+) -> List[ConstraintCheck]:
+    """Compile a data model version's constraints once and reuse them"""
+    key = (model_id, version)
+    with _cache_lock:
+        checks = _compiled_cache.get(key)
+        if checks is None:
+            checks = compile_constraints(schema)
+            _compiled_cache[key] = checks
+    return checks
+
+
+class ConstraintValidator:
+    """
+    Applies compiled checks to the chunks of one upload
+    
+    Every check is a vectorised mask over the chunk, so the cost is linear
+    in the number of rows. Uniqueness is tracked across chunks by keeping
+    the 64-bit hashes of values already seen per unique field.
+    """
+    
+    def __init__(self, checks: List[ConstraintCheck], schema: List[Dict[str, Any]]):
+        self.checks = checks
+        self.unique_fields = [f['name'] for f in schema if f.get('unique', False)]
+        self.field_types = {f['name']: f.get('type', 'string') for f in schema}
+        self._seen = {name: SeenHashes() for name in self.unique_fields}
+        self._violations = {}
+    
+    def _duplicate_mask(self, name: str, series: pd.Series) -> np.ndarray:
+        """True for values already seen earlier in the file"""
+        present, hashes = unique_hashes(series, self.field_types[name])
+        
+        duplicated = pd.Series(hashes).duplicated().to_numpy()
+        duplicated |= self._seen[name].contains(hashes)
+        self._seen[name].add(hashes)
+        
+        mask = np.zeros(len(series), dtype=bool)
+        mask[present] = duplicated
+        return mask
+    
+    def validate(
+        self,
+        df: pd.DataFrame,
+        validation_results: Dict[str, Any],
+        extra_violations: Dict[Tuple[str, str, str], np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Validate a chunk and add its counts and row errors to validation_results
+        
+        Args:
+            df: Type-converted chunk
+            validation_results: Accumulator from new_validation_results()
+            extra_violations: Masks computed elsewhere, keyed by
+                (field, rule, message), e.g. failed type conversions
+        
+        Returns:
+            Boolean mask of valid rows
+        """
+        violations = dict(extra_violations or {})
+        # Values that failed conversion are null now, but they were present
+        type_failures = {
+            field: mask for (field, rule, _), mask in violations.items() if rule == 'type'
+        }
+        
+        for check in self.checks:
+            if check.field not in df.columns:
+                continue
+            series = df[check.field]
+            if check.rule == 'required':
+                mask = check.test(series)
+                if check.field in type_failures:
+                    mask = mask & ~type_failures[check.field]
+            else:
+                present = series.notna().to_numpy()
+                mask = np.zeros(len(series), dtype=bool)
+                if present.any():
+                    mask[present] = check.test(series[present])
+            violations[(check.field, check.rule, check.message)] = mask
+        
+        for name in self.unique_fields:
+            if name in df.columns:
+                violations[(name, 'unique', "Duplicate value in file")] = (
+                    self._duplicate_mask(name, df[name])
+                )
+        
+        invalid = np.zeros(len(df), dtype=bool)
+        counts = validation_results.setdefault('constraint_violations', {})
+        row_errors = validation_results.setdefault('row_errors', [])
+        
+        for (field, rule, message), mask in violations.items():
+            violated = int(mask.sum())
+            if not violated:
+                continue
+            invalid |= mask
+            
+            field_counts = counts.setdefault(field, {})
+            field_counts[rule] = field_counts.get(rule, 0) + violated
+            
+            # Detailed reports are capped; counts above stay exact
+            room = settings.UPLOAD_MAX_ERROR_ROWS - len(row_errors)
+            if room > 0:
+                rows = df.index.to_numpy()[np.flatnonzero(mask)[:room]]
+                row_errors.extend(
+                    {"row": int(row), "field": field, "rule": rule, "error": message}
+                    for row in rows
+                )
+        
+        self._violations = violations
+        
+        valid_count = len(df) - int(invalid.sum())
+        validation_results['valid_rows'] += valid_count
+        validation_results['invalid_rows'] += len(df) - valid_count
+        
+        return ~invalid
+    
+    def rejection_reasons(self, valid: np.ndarray) -> List[List[Dict[str, str]]]:
+        """
+        Reasons each invalid row of the last validated chunk was rejected
+        
+        Args:
+            valid: Mask returned by validate()
+        
+        Returns:
+            One list of {field, rule, error} per invalid row, in row order
+        """
+        positions = np.flatnonzero(~valid)
+        reasons = {int(position): [] for position in positions}
+        
+        for (field, rule, message), mask in self._violations.items():
+            reason = {"field": field, "rule": rule, "error": message}
+            for position in np.flatnonzero(mask):
+                reasons[int(position)].append(reason)
+        
+        return [reasons[int(position)] for position in positions]
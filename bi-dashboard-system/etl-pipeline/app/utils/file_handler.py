@@ -3,15 +3,66 @@ File Handling Utilities
 etl-pipeline/app/utils/file_handler.py
 """
 import pandas as pd
+import numpy as np
 import os
-from typing import Dict, Any, List, Tuple
+import hashlib
+import io
+import uuid
+import zipfile
+from typing import Dict, Any, List, Tuple, Iterator, Callable
+from itertools import islice
 from pathlib import Path
 import logging
 
 from ..config import settings
+from .constraints import ConstraintCheck, ConstraintValidator, compile_constraints
+from .metrics import StageTimer, frame_bytes
+from .compaction import compact_column, compaction_summary
+from .type_inference import (
+    reservoir_sample,
+    infer_column_types,
+    infer_dtype_types,
+    get_cached_types,
+    cache_types
+)
 
 logger = logging.getLogger(__name__)
 
+# Block size used when copying uploads to disk
+COPY_BLOCK_SIZE = 1024 * 1024
+
+# Compressed CSV extensions and the pandas codec that streams each one
+COMPRESSED_CSV_EXTENSIONS = {
+    'csv.gz': 'gzip',
+    'csv.zst': 'zstd',
+    'zip': 'zip',
+}
+CSV_EXTENSIONS = ('csv',) + tuple(COMPRESSED_CSV_EXTENSIONS)
+
+# Self-describing columnar formats, read through pyarrow
+PARQUET_EXTENSIONS = ('parquet',)
+ARROW_EXTENSIONS = ('arrow', 'feather')
+
+# Places of a file the type inference sample is read from
+SAMPLE_WINDOWS = 20
+
+
+def get_file_extension(filename: str) -> str:
+    """
+    File extension, including the format part of compound ones
+    
+    Args:
+        filename: Name or path of the file
+    
+    Returns:
+        Lower-case extension without the leading dot, e.g. 'csv' or 'csv.gz'
+    """
+    name = filename.lower()
+    for ext in COMPRESSED_CSV_EXTENSIONS:
+        if name.endswith('.' + ext):
+            return ext
+    return name.rsplit('.', 1)[-1] if '.' in name else ''
+
 
 def validate_file(filename: str, file_size: int) -> Tuple[bool, str]:
     """
@@ -25,12 +76,12 @@ def validate_file(filename: str, file_size: int) -> Tuple[bool, str]:
         Tuple of (is_valid, error_message)
     """
     # Check file extension
-    file_ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    file_ext = get_file_extension(filename)
     
     if file_ext not in settings.allowed_extensions:
         return False, f"Invalid file type. Allowed types: {', '.join(settings.allowed_extensions)}"
     
-    # Check file size
+    # Check file size; compressed files are limited by their compressed size
     if file_size > settings.MAX_UPLOAD_SIZE:
         max_size_mb = settings.MAX_UPLOAD_SIZE / (1024 * 1024)
         return False, f"File size exceeds maximum allowed size of {max_size_mb}MB"
@@ -38,51 +89,380 @@ def validate_file(filename: str, file_size: int) -> Tuple[bool, str]:
     return True, ""
 
 
-def read_file_preview(file_path: str, rows: int = 10) -> Dict[str, Any]:
+def _read_xlsx_chunks(
+    file_path: str,
+    chunksize: int,
+    skip_rows: int = 0,
+    nrows: int = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the first sheet of an .xlsx workbook in row chunks
+    
+    Uses openpyxl's read-only mode, which parses rows as they are iterated
+    instead of building the whole workbook in memory.
+    
+    Args:
+        file_path: Path to the workbook
+        chunksize: Rows per chunk
+        skip_rows: Number of data rows to skip
+        nrows: Stop after this many data rows (default: read all)
+    
+    Yields:
+        pandas DataFrame chunks indexed by data row number
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(name) if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+        width = len(columns)
+        
+        # Fully blank rows are dropped, as pd.read_excel does
+        data_rows = (
+            values for values in rows
+            if any(value is not None for value in values)
+        )
+        data_rows = islice(data_rows, skip_rows, None if nrows is None else skip_rows + nrows)
+        
+        start = skip_rows
+        while True:
+            buffer = [
+                tuple(values[:width]) + (None,) * (width - len(values))
+                for values in islice(data_rows, chunksize)
+            ]
+            if not buffer:
+                break
+            
+            chunk = pd.DataFrame.from_records(
+                buffer,
+                columns=columns,
+                index=pd.RangeIndex(start, start + len(buffer))
+            ).infer_objects()
+            start += len(buffer)
+            yield chunk
+    finally:
+        workbook.close()
+
+
+def _limit_rows(chunks: Iterator[pd.DataFrame], max_rows: int) -> Iterator[pd.DataFrame]:
+    """Chunks up to max_rows rows in total; the source is not read any further"""
+    remaining = max_rows
+    for chunk in chunks:
+        yield chunk.iloc[:remaining]
+        remaining -= len(chunk)
+        # Stop before the next chunk is parsed
+        if remaining <= 0:
+            break
+
+
+def _sample_csv_windows(file_path: str, max_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Rows from SAMPLE_WINDOWS evenly spaced places of an uncompressed CSV
+    
+    Each window seeks to its byte offset, skips to the next line break and
+    parses the lines that follow, so the whole file is never read. A
+    window that starts inside a quoted line break may not parse; it is
+    skipped. Windows of small files run into each other, in which case
+    the file is simply read once from the top.
+    
+    Args:
+        file_path: Path to the CSV file
+        max_rows: Rows read over all windows
+    
+    Yields:
+        One DataFrame per window
+    """
+    window_rows = max(1, max_rows // SAMPLE_WINDOWS)
+    size = os.path.getsize(file_path)
+    
+    with open(file_path, 'rb') as source:
+        header = source.readline()
+        body_start = end = source.tell()
+        start_row = 0
+        
+        for window in range(SAMPLE_WINDOWS):
+            offset = body_start + (size - body_start) * window // SAMPLE_WINDOWS
+            if offset > end:
+                source.seek(offset - 1)
+                source.readline()  # Resync on the next line break
+            else:
+                source.seek(end)
+            
+            lines = list(islice(iter(source.readline, b''), window_rows))
+            end = source.tell()
+            if not lines:
+                break
+            
+            try:
+                chunk = pd.read_csv(io.BytesIO(header + b''.join(lines)))
+            except (pd.errors.ParserError, UnicodeDecodeError):
+                continue
+            chunk.index = pd.RangeIndex(start_row, start_row + len(chunk))
+            start_row += len(chunk)
+            yield chunk
+
+
+def _sample_parquet_row_groups(file_path: str, max_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Leading rows of up to SAMPLE_WINDOWS evenly spaced Parquet row groups
+    
+    Args:
+        file_path: Path to the Parquet file
+        max_rows: Rows read over all row groups
+    
+    Yields:
+        One typed DataFrame per sampled row group
+    """
+    pa = _import_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(file_path)
+    groups = parquet_file.metadata.num_row_groups
+    if groups == 0:
+        return
+    
+    picked = np.unique(np.linspace(0, groups - 1, min(groups, SAMPLE_WINDOWS)).round().astype(int))
+    group_rows = max(1, max_rows // len(picked))
+    
+    start_row = 0
+    for group in picked:
+        batch = next(parquet_file.iter_batches(batch_size=group_rows, row_groups=[int(group)]), None)
+        if batch is None:
+            continue
+        yield _arrow_frame(pa.Table.from_batches([batch]), start_row)
+        start_row += batch.num_rows
+
+
+def infer_file_types(file_path: str, content_hash: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Infer column types from a sample spread over the file
+    
+    At most TYPE_INFERENCE_SCAN_ROWS rows are read, far more than the
+    preview shows, so blank or unusual rows do not decide the type while
+    a preview of a large file never parses all of it. Uncompressed CSV is
+    sampled at evenly spaced byte offsets and Parquet at evenly spaced row
+    groups; typed Parquet columns keep their own type and only text
+    columns are inferred from values. Compressed CSV and xlsx cannot be
+    read from the middle, so their leading rows are sampled; .xls is
+    parsed whole and sampled throughout. Results are cached by content
+    hash when one is given.
+    
+    Args:
+        file_path: Path to the file
+        content_hash: SHA-256 of the file content
+    
+    Returns:
+        Dictionary of column -> {"type", "confidence", "sampled"}
+    """
+    if content_hash:
+        inferred = get_cached_types(content_hash)
+        if inferred is not None:
+            return inferred
+    
+    scan_rows = settings.TYPE_INFERENCE_SCAN_ROWS
+    file_ext = get_file_extension(file_path)
+    
+    if file_ext in PARQUET_EXTENSIONS:
+        frames = list(_sample_parquet_row_groups(file_path, scan_rows))
+        sample = pd.concat(frames) if frames else pd.DataFrame()
+        inferred = infer_dtype_types(sample)
+        text_columns = [
+            col for col in sample.columns
+            if inferred[str(col)]["type"] == 'string'
+        ]
+        inferred.update(infer_column_types(sample[text_columns]))
+    else:
+        if file_ext == 'csv':
+            source = chunks = _sample_csv_windows(file_path, scan_rows)
+        else:
+            source = read_file_chunks(file_path, chunksize=min(settings.UPLOAD_CHUNK_SIZE, scan_rows))
+            # .xls is parsed whole anyway, so all of its rows are sampled
+            chunks = source if file_ext == 'xls' else _limit_rows(source, scan_rows)
+        sample = reservoir_sample(chunks, settings.TYPE_INFERENCE_SAMPLE_ROWS, seed=0)
+        source.close()
+        inferred = infer_column_types(sample)
+    
+    if content_hash:
+        cache_types(content_hash, inferred)
+    return inferred
+
+
+def _import_pyarrow():
+    """pyarrow is only needed for columnar uploads, so import it on first use"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet and Arrow uploads require the pyarrow package")
+    return pyarrow
+
+
+def _arrow_frame(table, start: int) -> pd.DataFrame:
+    """Convert an Arrow table to a DataFrame indexed from the given data row"""
+    df = table.to_pandas()
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def _iter_arrow_batches(file_path: str) -> Iterator[Any]:
+    """Record batches of an Arrow IPC file (or stream), memory-mapped"""
+    pa = _import_pyarrow()
+    with pa.memory_map(file_path, 'r') as source:
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            source.seek(0)
+            yield from pa.ipc.open_stream(source)
+            return
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+def _read_columnar_chunks(
+    file_path: str,
+    chunksize: int,
+    skip_rows: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a Parquet or Arrow IPC file as typed DataFrame chunks
+    
+    Record batches are regrouped to chunksize rows and converted straight
+    from their column buffers, so no value is parsed from text.
+    
+    Args:
+        file_path: Path to the file
+        chunksize: Rows per chunk
+        skip_rows: Number of data rows to skip
+    
+    Yields:
+        pandas DataFrame chunks indexed by data row number
+    """
+    pa = _import_pyarrow()
+    file_ext = get_file_extension(file_path)
+    
+    if file_ext in PARQUET_EXTENSIONS:
+        parquet_file = pa.parquet.ParquetFile(file_path)
+        
+        # Whole row groups before skip_rows are never read
+        first_group = 0
+        to_skip = skip_rows
+        metadata = parquet_file.metadata
+        while first_group < metadata.num_row_groups and \
+                metadata.row_group(first_group).num_rows <= to_skip:
+            to_skip -= metadata.row_group(first_group).num_rows
+            first_group += 1
+        
+        batches = parquet_file.iter_batches(
+            batch_size=chunksize,
+            row_groups=range(first_group, metadata.num_row_groups)
+        )
+    else:
+        to_skip = skip_rows
+        batches = _iter_arrow_batches(file_path)
+    
+    pending = []
+    pending_rows = 0
+    start = skip_rows
+    
+    for batch in batches:
+        if to_skip:
+            if batch.num_rows <= to_skip:
+                to_skip -= batch.num_rows
+                continue
+            batch = batch.slice(to_skip)
+            to_skip = 0
+        
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        
+        while pending_rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield _arrow_frame(table.slice(0, chunksize), start)
+            start += chunksize
+            
+            rest = table.slice(chunksize)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+    
+    if pending_rows:
+        yield _arrow_frame(pa.Table.from_batches(pending), start)
+
+
+def _read_columnar_preview(file_path: str, rows: int) -> pd.DataFrame:
+    """First rows of a Parquet or Arrow file, reading only the footer and first row group"""
+    pa = _import_pyarrow()
+    file_ext = get_file_extension(file_path)
+    
+    if file_ext in PARQUET_EXTENSIONS:
+        parquet_file = pa.parquet.ParquetFile(file_path)
+        if parquet_file.metadata.num_row_groups == 0:
+            return parquet_file.schema_arrow.empty_table().to_pandas()
+        return _arrow_frame(parquet_file.read_row_group(0).slice(0, rows), 0)
+    
+    return next(_read_columnar_chunks(file_path, rows), pd.DataFrame())
+
+
+def read_file_preview(file_path: str, rows: int = 10, content_hash: str = None) -> Dict[str, Any]:
     """
     Read and preview file contents
     
     Args:
         file_path: Path to the file
         rows: Number of rows to preview
+        content_hash: SHA-256 of the file, used to cache type inference
     
     Returns:
         Dictionary with preview data
     """
     try:
-        file_ext = file_path.rsplit('.', 1)[-1].lower()
+        file_ext = get_file_extension(file_path)
         
         # Read file based on extension
-        if file_ext == 'csv':
-            df = pd.read_csv(file_path, nrows=rows)
-        elif file_ext in ['xlsx', 'xls']:
+        if file_ext in CSV_EXTENSIONS:
+            # Only the leading rows are decompressed
+            df = pd.read_csv(
+                file_path,
+                nrows=rows,
+                compression=COMPRESSED_CSV_EXTENSIONS.get(file_ext)
+            )
+        elif file_ext == 'xlsx':
+            # Stops reading the workbook once enough rows are parsed
+            df = next(_read_xlsx_chunks(file_path, rows, nrows=rows), pd.DataFrame())
+        elif file_ext == 'xls':
             df = pd.read_excel(file_path, nrows=rows)
+        elif file_ext in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+            df = _read_columnar_preview(file_path, rows)
         else:
             raise ValueError(f"Unsupported file type: {file_ext}")
         
-        # Detect data types
+        # Detect data types from a sample of the whole file, not just the head;
+        # Arrow files carry their types in the schema
+        if file_ext in ARROW_EXTENSIONS:
+            inferred = infer_dtype_types(df)
+        else:
+            inferred = infer_file_types(file_path, content_hash)
         detected_types = {}
+        type_confidence = {}
         for col in df.columns:
-            dtype = str(df[col].dtype)
-            if 'int' in dtype:
-                detected_types[col] = 'number'
-            elif 'float' in dtype:
-                detected_types[col] = 'number'
-            elif 'datetime' in dtype:
-                detected_types[col] = 'date'
-            elif 'bool' in dtype:
-                detected_types[col] = 'boolean'
-            else:
-                detected_types[col] = 'string'
+            column_type = inferred.get(str(col), {"type": "string", "confidence": 0.0})
+            detected_types[col] = column_type["type"]
+            type_confidence[col] = column_type["confidence"]
         
         return {
             "columns": df.columns.tolist(),
             "sample_data": df.to_dict(orient='records'),
             "row_count": len(df),
             "detected_types": detected_types,
+            "type_confidence": type_confidence,
             "success": True
         }
-        
+    
     except Exception as e:
         logger.error(f"Error reading file preview: {e}")
         return {
@@ -101,16 +481,269 @@ def read_full_file(file_path: str) -> pd.DataFrame:
     Returns:
         pandas DataFrame
     """
-    file_ext = file_path.rsplit('.', 1)[-1].lower()
+    file_ext = get_file_extension(file_path)
     
-    if file_ext == 'csv':
-        return pd.read_csv(file_path)
-    elif file_ext in ['xlsx', 'xls']:
+    if file_ext in CSV_EXTENSIONS:
+        return pd.read_csv(file_path, compression=COMPRESSED_CSV_EXTENSIONS.get(file_ext))
+    elif file_ext == 'xlsx':
+        chunks = list(_read_xlsx_chunks(file_path, settings.UPLOAD_CHUNK_SIZE))
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+    elif file_ext == 'xls':
         return pd.read_excel(file_path)
+    elif file_ext in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        chunks = list(_read_columnar_chunks(file_path, settings.UPLOAD_CHUNK_SIZE))
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+    else:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+
+
+def read_file_chunks(
+    file_path: str,
+    chunksize: int = None,
+    skip_rows: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Read file as a stream of fixed-size DataFrame chunks
+    
+    Args:
+        file_path: Path to the file
+        chunksize: Rows per chunk (default: settings.UPLOAD_CHUNK_SIZE)
+        skip_rows: Number of data rows to skip, e.g. when resuming
+    
+    Yields:
+        pandas DataFrame chunks indexed by data row number
+    """
+    if chunksize is None:
+        chunksize = settings.UPLOAD_CHUNK_SIZE
+    
+    file_ext = get_file_extension(file_path)
+    
+    if file_ext in CSV_EXTENSIONS:
+        # Compressed files are decompressed as a stream, never to disk
+        with pd.read_csv(
+            file_path,
+            chunksize=chunksize,
+            compression=COMPRESSED_CSV_EXTENSIONS.get(file_ext)
+        ) as reader:
+            # Skipped rows go through the same parser and are discarded: a
+            # record is not a line once blank lines or quoted line breaks
+            # appear, so skiprows= would land on the wrong row
+            remaining = skip_rows
+            while remaining:
+                try:
+                    remaining -= len(reader.get_chunk(min(remaining, chunksize)))
+                except StopIteration:
+                    return
+            
+            yield from reader
+    elif file_ext == 'xlsx':
+        yield from _read_xlsx_chunks(file_path, chunksize, skip_rows)
+    elif file_ext == 'xls':
+        # Legacy .xls has no streaming reader, so slice the parsed sheet
+        df = pd.read_excel(file_path)
+        for start in range(skip_rows, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    elif file_ext in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        yield from _read_columnar_chunks(file_path, chunksize, skip_rows)
     else:
         raise ValueError(f"Unsupported file type: {file_ext}")
 
 
+def new_validation_results() -> Dict[str, Any]:
+    """Create an empty validation results accumulator"""
+    return {
+        "total_rows": 0,
+        "valid_rows": 0,
+        "invalid_rows": 0,
+        "errors": [],  # File-level problems (missing columns, failed conversions)
+        "row_errors": [],  # Per-row constraint violations, capped
+        "constraint_violations": {}  # field -> rule -> count
+    }
+
+
+def _add_error(validation_results: Dict[str, Any], error: Dict[str, Any]) -> None:
+    """Record a schema-level error once, however many chunks raise it"""
+    if error not in validation_results['errors']:
+        validation_results['errors'].append(error)
+
+
+def _has_field_type(series: pd.Series, field_type: str) -> bool:
+    """True if a column's dtype already matches a schema field type"""
+    if field_type == 'number':
+        return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+    if field_type == 'date':
+        return pd.api.types.is_datetime64_any_dtype(series)
+    if field_type == 'boolean':
+        return pd.api.types.is_bool_dtype(series)
+    return False
+
+
+def _validate_chunk(
+    df: pd.DataFrame,
+    data_model_schema: List[Dict[str, Any]],
+    validation_results: Dict[str, Any],
+    validator: ConstraintValidator,
+    compact: bool = False
+) -> Tuple[pd.DataFrame, pd.DataFrame, List[List[Dict[str, Any]]]]:
+    """
+    Convert types of a single chunk and add its counts to validation_results
+    
+    With compact, each column is narrowed as soon as it is converted, so
+    the wide version is released before the next column is built. The
+    first compacted chunk of an upload is measured into
+    validation_results['compaction'].
+    
+    Returns:
+        Tuple of (valid converted rows, invalid rows with their values as
+        read, list of reasons per invalid row)
+    """
+    validation_results['total_rows'] += len(df)
+    
+    # Validate against schema
+    schema_fields = {field['name']: field for field in data_model_schema}
+    failures = {}
+    originals = {}
+    sizes = {} if compact and validation_results.get('compaction') is None else None
+    
+    for field_name, field_def in schema_fields.items():
+        if field_name not in df.columns:
+            if field_def.get('required', False):
+                _add_error(validation_results, {
+                    "field": field_name,
+                    "error": "Required field missing"
+                })
+                # No row has the value, so none of them may be loaded
+                key = (field_name, 'required', "Required field missing")
+                failures[key] = np.ones(len(df), dtype=bool)
+            continue
+        
+        # Type conversion and validation
+        try:
+            original = converted = df[field_name]
+            if _has_field_type(original, field_def['type']):
+                # Typed sources (Parquet, Arrow) need no conversion
+                pass
+            elif field_def['type'] == 'number':
+                converted = pd.to_numeric(original, errors='coerce')
+            elif field_def['type'] == 'date':
+                converted = pd.to_datetime(original, errors='coerce')
+            elif field_def['type'] == 'boolean':
+                converted = original.astype(bool)
+            if converted is not original:
+                originals[field_name] = original
+            
+            # Values that were present but could not be converted
+            if field_def['type'] in ('number', 'date'):
+                failed = (converted.isna() & original.notna()).to_numpy()
+                if failed.any():
+                    key = (field_name, 'type', f"Invalid {field_def['type']} value")
+                    failures[key] = failed
+            
+            if compact:
+                converted = compact_column(converted, sizes)
+            df[field_name] = converted
+        except Exception as e:
+            _add_error(validation_results, {
+                "field": field_name,
+                "error": f"Type conversion error: {str(e)}"
+            })
+    
+    if sizes is not None:
+        validation_results['compaction'] = compaction_summary(df, sizes)
+    
+    # Constraint checks count valid/invalid rows and record row errors
+    valid = validator.validate(df, validation_results, failures)
+    if valid.all():
+        return df, df.iloc[:0], []
+    
+    # Rejected rows keep the values from the file, not the failed conversions
+    rejected = df[~valid].copy()
+    for field_name, original in originals.items():
+        rejected[field_name] = original[~valid]
+    
+    return df[valid], rejected, validator.rejection_reasons(valid)
+
+
+def process_upload_chunks(
+    file_path: str,
+    data_model_schema: List[Dict[str, Any]],
+    validation_results: Dict[str, Any],
+    column_mapping: Dict[str, str] = None,
+    chunksize: int = None,
+    checks: List[ConstraintCheck] = None,
+    skip_rows: int = 0,
+    timer: StageTimer = None,
+    on_rejected: Callable[[pd.DataFrame, List[List[Dict[str, Any]]]], None] = None,
+    compact: bool = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an uploaded file through type conversion and validation
+    
+    Only one chunk is held in memory at a time, so peak memory does not
+    grow with the file size. Only valid rows are yielded.
+    
+    Args:
+        file_path: Path to uploaded file
+        data_model_schema: Schema definition
+        validation_results: Accumulator from new_validation_results(),
+            updated in place as chunks are processed
+        column_mapping: Optional mapping of file columns to schema fields
+        chunksize: Rows per chunk (default: settings.UPLOAD_CHUNK_SIZE)
+        checks: Compiled constraint checks (default: compiled from the schema)
+        skip_rows: Number of data rows to skip, e.g. when resuming
+        timer: Records the "read" and "validate" stages when given
+        on_rejected: Called with the invalid rows of each chunk, as read
+            from the file, and the reasons each was rejected
+        compact: Narrow column dtypes during conversion (default:
+            settings.UPLOAD_COMPACT_FRAMES)
+    
+    Yields:
+        Valid rows of each chunk, type-converted
+    """
+    if checks is None:
+        checks = compile_constraints(data_model_schema)
+    validator = ConstraintValidator(checks, data_model_schema)
+    if compact is None:
+        compact = settings.UPLOAD_COMPACT_FRAMES
+    
+    chunks = read_file_chunks(file_path, chunksize, skip_rows)
+    if timer is not None:
+        chunks = timer.iterate("read", chunks)
+    
+    try:
+        for chunk in chunks:
+            # Compressed uploads are size-checked before they are expanded,
+            # so the decompressed row count has its own limit
+            if validation_results['total_rows'] + len(chunk) > settings.MAX_UPLOAD_ROWS:
+                raise ValueError(
+                    f"File exceeds the maximum of {settings.MAX_UPLOAD_ROWS} rows"
+                )
+            
+            # Apply column mapping if provided
+            if column_mapping:
+                chunk = chunk.rename(columns=column_mapping)
+            
+            if timer is None:
+                chunk, rejected, reasons = _validate_chunk(
+                    chunk, data_model_schema, validation_results, validator, compact
+                )
+            else:
+                with timer.stage("validate") as stage:
+                    stage.rows += len(chunk)
+                    stage.bytes += frame_bytes(chunk)
+                    chunk, rejected, reasons = _validate_chunk(
+                        chunk, data_model_schema, validation_results, validator, compact
+                    )
+            
+            if len(rejected) and on_rejected is not None:
+                on_rejected(rejected, reasons)
+            yield chunk
+    
+    except Exception as e:
+        logger.error(f"Error processing upload: {e}")
+        raise
+
+
 def process_upload(
     file_path: str,
     data_model_schema: List[Dict[str, Any]],
@@ -119,6 +752,8 @@ def process_upload(
     """
     Process uploaded file according to data model schema
     
+    Loads the whole file; use process_upload_chunks() for large files.
+    
     Args:
         file_path: Path to uploaded file
         data_model_schema: Schema definition
@@ -127,73 +762,31 @@ def process_upload(
     Returns:
         Tuple of (processed_dataframe, validation_results)
     """
-    try:
-        # Read file
-        df = read_full_file(file_path)
-        
-        # Apply column mapping if provided
-        if column_mapping:
-            df = df.rename(columns=column_mapping)
-        
-        validation_results = {
-            "total_rows": len(df),
-            "valid_rows": 0,
-            "invalid_rows": 0,
-            "errors": []
-        }
-        
-        # Validate against schema
-        schema_fields = {field['name']: field for field in data_model_schema}
-        
-        for field_name, field_def in schema_fields.items():
-            if field_name not in df.columns:
-                if field_def.get('required', False):
-                    validation_results['errors'].append({
-                        "field": field_name,
-                        "error": "Required field missing"
-                    })
-                continue
-            
-            # Type conversion and validation
-            try:
-                if field_def['type'] == 'number':
-                    df[field_name] = pd.to_numeric(df[field_name], errors='coerce')
-                elif field_def['type'] == 'date':
-                    df[field_name] = pd.to_datetime(df[field_name], errors='coerce')
-                elif field_def['type'] == 'boolean':
-                    df[field_name] = df[field_name].astype(bool)
-            except Exception as e:
-                validation_results['errors'].append({
-                    "field": field_name,
-                    "error": f"Type conversion error: {str(e)}"
-                })
-        
-        # Count valid rows (rows without null values in required fields)
-        required_fields = [f['name'] for f in data_model_schema if f.get('required', False)]
-        if required_fields:
-            valid_mask = df[required_fields].notna().all(axis=1)
-            validation_results['valid_rows'] = valid_mask.sum()
-            validation_results['invalid_rows'] = (~valid_mask).sum()
-        else:
-            validation_results['valid_rows'] = len(df)
-        
-        return df, validation_results
-        
-    except Exception as e:
-        logger.error(f"Error processing upload: {e}")
-        raise
+    validation_results = new_validation_results()
+    chunks = list(process_upload_chunks(
+        file_path,
+        data_model_schema,
+        validation_results,
+        column_mapping
+    ))
+    
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return df, validation_results
 
 
-def save_upload_file(file, upload_dir: str = None) -> str:
+def stream_upload_file(file, upload_dir: str = None) -> Tuple[str, str, int]:
     """
-    Save uploaded file to disk
+    Copy uploaded file to disk in fixed-size blocks
+    
+    The SHA-256 digest and byte count are computed during the copy, so the
+    upload is never held in memory as a whole and never read twice.
     
     Args:
         file: File object
         upload_dir: Directory to save file (default: settings.UPLOAD_DIR)
     
     Returns:
-        Path to saved file
+        Tuple of (file_path, sha256_hex, size_in_bytes)
     """
     if upload_dir is None:
         upload_dir = settings.UPLOAD_DIR
@@ -201,14 +794,126 @@ def save_upload_file(file, upload_dir: str = None) -> str:
     # Create directory if it doesn't exist
     os.makedirs(upload_dir, exist_ok=True)
     
-    # Generate unique filename
+    # Generate unique filename; same-named files can arrive in the same second
+    file_path = os.path.join(upload_dir, _stored_name(file.filename))
+    
+    file.file.seek(0)
+    content_hash, size = _copy_stream(file.file, file_path)
+    
+    return file_path, content_hash, size
+
+
+def _stored_name(name: str) -> str:
+    """Unique name on disk for an uploaded or extracted file"""
     timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{file.filename}"
-    file_path = os.path.join(upload_dir, filename)
+    return f"{timestamp}_{uuid.uuid4().hex}_{os.path.basename(name)}"
+
+
+def _copy_stream(source, file_path: str, max_bytes: int = None) -> Tuple[str, int]:
+    """
+    Copy a file object to disk in blocks, returning its SHA-256 and size
+    
+    With max_bytes, the copy stops and the partial file is removed as soon
+    as more than that many bytes have been read, whatever size the source
+    claimed to have.
+    """
+    digest = hashlib.sha256()
+    size = 0
     
-    # Save file
     with open(file_path, "wb") as buffer:
-        content = file.file.read()
-        buffer.write(content)
+        while True:
+            block = source.read(COPY_BLOCK_SIZE)
+            if not block:
+                break
+            size += len(block)
+            if max_bytes is not None and size > max_bytes:
+                buffer.close()
+                os.remove(file_path)
+                raise ValueError(f"File exceeds {max_bytes} bytes")
+            digest.update(block)
+            buffer.write(block)
+    
+    return digest.hexdigest(), size
+
+
+def extract_archive(archive_path: str, upload_dir: str = None) -> List[Tuple[str, str, str, int]]:
+    """
+    Extract the files of a zip archive for separate upload
+    
+    Members are streamed to disk one at a time with the same block copy as
+    uploads. Directories and hidden files (e.g. __MACOSX) are skipped. Each
+    member is checked with validate_file against its declared size before
+    it is extracted, and the copy itself stops at MAX_UPLOAD_SIZE, since
+    the declared size can be forged. At most ARCHIVE_MAX_MEMBERS files and
+    ARCHIVE_MAX_TOTAL_SIZE bytes are extracted per archive.
     
-    return file_path
\ No newline at end of file
+    Args:
+        archive_path: Path to the zip file
+        upload_dir: Directory to extract into (default: settings.UPLOAD_DIR)
+    
+    Returns:
+        List of (member_path, file_path, sha256_hex, size_in_bytes) in archive
+        order, member_path being the member's full path inside the archive
+    """
+    if upload_dir is None:
+        upload_dir = settings.UPLOAD_DIR
+    
+    extracted = []
+    remaining = settings.ARCHIVE_MAX_TOTAL_SIZE
+    
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [
+                member for member in archive.infolist()
+                if not member.is_dir()
+                and os.path.basename(member.filename)
+                and not os.path.basename(member.filename).startswith('.')
+                and not member.filename.startswith('__MACOSX')
+            ]
+            if len(members) > settings.ARCHIVE_MAX_MEMBERS:
+                raise ValueError(
+                    f"Archive holds {len(members)} files, more than {settings.ARCHIVE_MAX_MEMBERS}"
+                )
+            
+            for member in members:
+                name = os.path.basename(member.filename)
+                is_valid, error_msg = validate_file(name, member.file_size)
+                if not is_valid:
+                    raise ValueError(f"{member.filename}: {error_msg}")
+                
+                limit = min(settings.MAX_UPLOAD_SIZE, remaining)
+                file_path = os.path.join(upload_dir, _stored_name(name))
+                with archive.open(member) as source:
+                    try:
+                        content_hash, size = _copy_stream(source, file_path, max_bytes=limit)
+                    except ValueError:
+                        if limit < settings.MAX_UPLOAD_SIZE:
+                            raise ValueError(
+                                f"Archive extracts to more than {settings.ARCHIVE_MAX_TOTAL_SIZE} bytes"
+                            )
+                        raise ValueError(
+                            f"{member.filename}: file exceeds {settings.MAX_UPLOAD_SIZE} bytes"
+                        )
+                remaining -= size
+                extracted.append((member.filename, file_path, content_hash, size))
+    except Exception:
+        for _, file_path, _, _ in extracted:
+            os.remove(file_path)
+        raise
+    
+    return extracted
+
+
+def save_upload_file(file, upload_dir: str = None) -> str:
+    """
+    Save uploaded file to disk
+    
+    Args:
+        file: File object
+        upload_dir: Directory to save file (default: settings.UPLOAD_DIR)
+    
+    Returns:
+        Path to saved file
+    """
+    file_path, _, _ = stream_upload_file(file, upload_dir)
+    return file_path
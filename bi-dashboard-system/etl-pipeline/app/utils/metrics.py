@@ -0,0 +1,182 @@
+"""
+Upload Stage Metrics Utilities
+etl-pipeline/app/utils/metrics.py
+"""
+from typing import Dict, Any, List, Iterable, Iterator
+from contextlib import contextmanager
+import os
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int:
+    """
+    Resident set size of this process
+    
+    Read from /proc where available; elsewhere the peak RSS reported by
+    getrusage is the closest substitute.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        if resource is None:
+            return 0
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if peak > 1 << 32 else peak * 1024
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Shallow in-memory size of a chunk; cheap enough to take per chunk"""
+    return int(df.memory_usage(index=False, deep=False).sum())
+
+
+class Stage:
+    """
+    Totals of one named stage, accumulated over every time it runs
+    
+    bytes is the file size for the save stage and the in-memory size of
+    the chunks handled for the others.
+    """
+    
+    def __init__(self, values: Dict[str, Any] = None):
+        values = values or {}
+        self.calls = values.get("calls", 0)
+        self.seconds = values.get("seconds", 0.0)
+        self.rows = values.get("rows", 0)
+        self.bytes = values.get("bytes", 0)
+        self.peak_rss = values.get("peak_rss_bytes") or 0
+        self.peak_traced = values.get("peak_traced_bytes")
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 4),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_second": round(self.rows / self.seconds) if self.rows and self.seconds else None,
+            "bytes_per_second": round(self.bytes / self.seconds) if self.bytes and self.seconds else None,
+            "peak_rss_bytes": self.peak_rss,
+            "peak_traced_bytes": self.peak_traced,
+        }
+
+
+class StageTimer:
+    """
+    Times the stages of one upload
+    
+    Each stage records wall time, rows and bytes, so throughput can be
+    compared between stages, and the peak memory seen while it ran. RSS
+    is sampled when a stage starts and ends; with UPLOAD_TRACE_MEMORY the
+    exact Python allocation peak is taken from tracemalloc as well, at a
+    noticeable cost. Both are process-wide, so uploads running in other
+    workers at the same time are included.
+    
+    Stages interleaved per chunk (read, validate, insert) accumulate into
+    one entry each.
+    """
+    
+    def __init__(self, stages: Dict[str, Dict[str, Any]] = None):
+        self.stages = {name: Stage(values) for name, values in (stages or {}).items()}
+        self.trace_memory = settings.UPLOAD_TRACE_MEMORY
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    def _stage(self, name: str) -> Stage:
+        if name not in self.stages:
+            self.stages[name] = Stage()
+        return self.stages[name]
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Stage]:
+        """
+        Time a block as (part of) a stage
+        
+        The stage is yielded so the block can add the rows and bytes it
+        handled.
+        """
+        stage = self._stage(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        rss = current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - start
+            stage.calls += 1
+            stage.peak_rss = max(stage.peak_rss, rss, current_rss_bytes())
+            if self.trace_memory:
+                traced = tracemalloc.get_traced_memory()[1]
+                stage.peak_traced = max(stage.peak_traced or 0, traced)
+    
+    def iterate(self, name: str, frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Wrap a chunk iterator, timing how long producing each chunk takes"""
+        iterator = iter(frames)
+        while True:
+            with self.stage(name) as stage:
+                try:
+                    frame = next(iterator)
+                except StopIteration:
+                    return
+                stage.rows += len(frame)
+                stage.bytes += frame_bytes(frame)
+            yield frame
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage numbers for the upload metadata"""
+        return {name: stage.summary() for name, stage in self.stages.items()}
+
+
+def aggregate_stages(uploads_stages: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Combine the stage metrics of many uploads
+    
+    Args:
+        uploads_stages: The "stages" metadata of each upload
+    
+    Returns:
+        Dictionary of stage -> uploads, total and percentile seconds,
+        overall throughput and the highest memory peak
+    """
+    combined = {}
+    for stages in uploads_stages:
+        for name, values in (stages or {}).items():
+            combined.setdefault(name, []).append(values)
+    
+    aggregated = {}
+    for name, entries in combined.items():
+        seconds = np.array([entry.get("seconds", 0.0) for entry in entries])
+        rows = sum(entry.get("rows", 0) for entry in entries)
+        size = sum(entry.get("bytes", 0) for entry in entries)
+        total = float(seconds.sum())
+        traced = [entry["peak_traced_bytes"] for entry in entries if entry.get("peak_traced_bytes")]
+        
+        aggregated[name] = {
+            "uploads": len(entries),
+            "total_seconds": round(total, 4),
+            "mean_seconds": round(float(seconds.mean()), 4),
+            "p50_seconds": round(float(np.percentile(seconds, 50)), 4),
+            "p95_seconds": round(float(np.percentile(seconds, 95)), 4),
+            "max_seconds": round(float(seconds.max()), 4),
+            "rows": rows,
+            "bytes": size,
+            "rows_per_second": round(rows / total) if rows and total else None,
+            "bytes_per_second": round(size / total) if size and total else None,
+            "max_peak_rss_bytes": max(entry.get("peak_rss_bytes") or 0 for entry in entries),
+            "max_peak_traced_bytes": max(traced) if traced else None,
+        }
+    return aggregated
@@ -0,0 +1,196 @@
+"""
+Parallel Validation Utilities
+etl-pipeline/app/utils/parallel_validation.py
+"""
+from concurrent.futures import ProcessPoolExecutor, Future
+from collections import deque
+from typing import Dict, Any, List, Tuple
+import multiprocessing
+import os
+import threading
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from .constraints import ConstraintValidator, SeenHashes, get_compiled_constraints, unique_hashes
+from .file_handler import read_file_chunks, new_validation_results, _add_error, _validate_chunk
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    return settings.DRY_RUN_WORKERS or os.cpu_count() or 1
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Create the process pool on first use
+    
+    Workers are spawned rather than forked, since the API process runs
+    threads that a fork would copy in an arbitrary state.
+    """
+    global _executor
+    
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=_worker_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def shutdown_validation_workers() -> None:
+    """Stop the process pool"""
+    global _executor
+    
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _validate_in_worker(
+    chunk: pd.DataFrame,
+    schema: List[Dict[str, Any]],
+    model_id: int,
+    version: int,
+    column_mapping: Dict[str, str] = None
+) -> Dict[str, Any]:
+    """
+    Convert and validate one chunk in a worker process
+    
+    Uniqueness is only checked within the chunk here; the hashes of the
+    unique fields are returned so the parent can check across chunks.
+    """
+    if column_mapping:
+        chunk = chunk.rename(columns=column_mapping)
+    
+    checks = get_compiled_constraints(model_id, version, schema)
+    validator = ConstraintValidator(checks, schema)
+    results = new_validation_results()
+    
+    # Columns are converted in place, so chunk holds every row converted
+    valid_rows, _, _ = _validate_chunk(chunk, schema, results, validator)
+    
+    unique = {
+        name: unique_hashes(chunk[name], validator.field_types[name])
+        for name in validator.unique_fields
+        if name in chunk.columns
+    }
+    
+    return {
+        "results": results,
+        "valid": chunk.index.isin(valid_rows.index),
+        "rows": chunk.index.to_numpy(),
+        "unique": unique,
+    }
+
+
+def _merge(
+    validation_results: Dict[str, Any],
+    part: Dict[str, Any],
+    seen: Dict[str, SeenHashes]
+) -> None:
+    """Add a worker's results, then flag values already seen in earlier chunks"""
+    results = part["results"]
+    for key in ("total_rows", "valid_rows", "invalid_rows"):
+        validation_results[key] += results[key]
+    for error in results["errors"]:
+        _add_error(validation_results, error)
+    
+    counts = validation_results["constraint_violations"]
+    for field, rules in results["constraint_violations"].items():
+        field_counts = counts.setdefault(field, {})
+        for rule, count in rules.items():
+            field_counts[rule] = field_counts.get(rule, 0) + count
+    
+    row_errors = validation_results["row_errors"]
+    room = settings.UPLOAD_MAX_ERROR_ROWS - len(row_errors)
+    row_errors.extend(results["row_errors"][:max(room, 0)])
+    
+    valid = part["valid"]
+    for name, (present, hashes) in part["unique"].items():
+        # Repeats within the chunk were already flagged by the worker
+        field_seen = seen.setdefault(name, SeenHashes())
+        duplicated = field_seen.contains(hashes)
+        duplicated &= ~pd.Series(hashes).duplicated().to_numpy()
+        field_seen.add(hashes)
+        if not duplicated.any():
+            continue
+        
+        positions = present[duplicated]
+        field_counts = counts.setdefault(name, {})
+        field_counts["unique"] = field_counts.get("unique", 0) + len(positions)
+        
+        # Rows already invalid for another reason are not counted twice
+        newly_invalid = int(valid[positions].sum())
+        valid[positions] = False
+        validation_results["valid_rows"] -= newly_invalid
+        validation_results["invalid_rows"] += newly_invalid
+        
+        room = settings.UPLOAD_MAX_ERROR_ROWS - len(row_errors)
+        row_errors.extend(
+            {"row": int(row), "field": name, "rule": "unique", "error": "Duplicate value in file"}
+            for row in part["rows"][positions[:max(room, 0)]]
+        )
+
+
+def validate_file_parallel(
+    file_path: str,
+    schema: List[Dict[str, Any]],
+    model_id: int,
+    version: int,
+    column_mapping: Dict[str, str] = None
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Validate a whole file without loading any of it into a database
+    
+    The file is read chunk by chunk in this process; type conversion and
+    constraint checks run on a pool of worker processes, one chunk each,
+    with at most two chunks per worker in flight. Results are merged in
+    file order, so counts and row errors match a real upload.
+    
+    Args:
+        file_path: Path to uploaded file
+        schema: Data model schema
+        model_id: Data model ID (compiled checks are cached per version)
+        version: Data model version
+        column_mapping: Optional mapping of file columns to schema fields
+    
+    Returns:
+        Tuple of (validation_results, number of worker processes)
+    """
+    executor = _get_executor()
+    workers = _worker_count()
+    validation_results = new_validation_results()
+    seen = {}
+    pending: "deque[Future]" = deque()
+    rows_read = 0
+    
+    try:
+        for chunk in read_file_chunks(file_path):
+            rows_read += len(chunk)
+            if rows_read > settings.MAX_UPLOAD_ROWS:
+                raise ValueError(
+                    f"File exceeds the maximum of {settings.MAX_UPLOAD_ROWS} rows"
+                )
+            
+            pending.append(executor.submit(
+                _validate_in_worker, chunk, schema, model_id, version, column_mapping
+            ))
+            if len(pending) >= workers * 2:
+                _merge(validation_results, pending.popleft().result(), seen)
+        
+        while pending:
+            _merge(validation_results, pending.popleft().result(), seen)
+    finally:
+        for future in pending:
+            future.cancel()
+    
+    return validation_results, workers
@@ -0,0 +1,176 @@
+"""
+Column Type Inference Utilities
+etl-pipeline/app/utils/type_inference.py
+"""
+from typing import Dict, Any, Iterable, Optional
+from collections import OrderedDict
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+BOOLEAN_VALUES = {'true', 'false', 'yes', 'no'}
+
+# A type wins when at least this share of the sampled values parse as it
+MIN_TYPE_SHARE = 0.5
+
+# Inferred types per file content hash, least recently used evicted first
+_inference_cache: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def reservoir_sample(
+    chunks: Iterable[pd.DataFrame],
+    size: int,
+    seed: int = None
+) -> pd.DataFrame:
+    """
+    Uniform random sample of at most size rows from a stream of chunks
+    
+    Algorithm R, applied a chunk at a time: the i-th row replaces a random
+    slot with probability size / (i + 1), so every row of the file is
+    equally likely to be kept and only size rows are held at once.
+    
+    Args:
+        chunks: DataFrame chunks with the same columns
+        size: Maximum rows in the sample
+        seed: Random seed
+    
+    Returns:
+        Sampled rows in file order
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    seen = 0
+    
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        
+        if reservoir is None:
+            # Object columns accept values whatever dtype later chunks get
+            reservoir = chunk.iloc[:size].astype(object)
+            taken = len(reservoir)
+        elif len(reservoir) < size:
+            taken = min(size - len(reservoir), len(chunk))
+            reservoir = pd.concat([reservoir, chunk.iloc[:taken].astype(object)])
+        else:
+            taken = 0
+        
+        rest = len(chunk) - taken
+        if rest > 0:
+            # Slot drawn for each remaining row; rows drawing >= size are dropped
+            positions = np.arange(seen + taken, seen + len(chunk))
+            slots = rng.integers(0, positions + 1)
+            accepted = np.flatnonzero(slots < size)
+            if len(accepted):
+                # Later rows overwrite earlier ones, as the sequential algorithm does
+                replacements = pd.Series(accepted + taken, index=slots[accepted])
+                replacements = replacements[~replacements.index.duplicated(keep='last')]
+                new_rows = chunk.iloc[replacements.to_numpy()]
+                
+                index = reservoir.index.to_numpy().copy()
+                index[replacements.index] = new_rows.index
+                reservoir.iloc[replacements.index.to_numpy()] = new_rows.to_numpy()
+                reservoir.index = index
+        
+        seen += len(chunk)
+    
+    if reservoir is None:
+        return pd.DataFrame()
+    return reservoir.sort_index()
+
+
+def infer_column_types(sample: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Infer a schema field type per column from a sample
+    
+    Every non-blank value is tried as boolean, number and date; the first
+    of those that at least MIN_TYPE_SHARE of the values parse as is chosen,
+    otherwise string. Confidence is the share of values agreeing with the
+    chosen type.
+    
+    Args:
+        sample: Sampled rows
+    
+    Returns:
+        Dictionary of column -> {"type", "confidence", "sampled"}
+    """
+    inferred = {}
+    
+    for col in sample.columns:
+        values = sample[col].dropna().astype(str).str.strip()
+        values = values[values != '']
+        
+        if len(values) == 0:
+            inferred[str(col)] = {"type": "string", "confidence": 0.0, "sampled": 0}
+            continue
+        
+        shares = {
+            'boolean': values.str.lower().isin(BOOLEAN_VALUES).mean(),
+            'number': pd.to_numeric(values, errors='coerce').notna().mean(),
+        }
+        if shares['number'] < MIN_TYPE_SHARE:
+            shares['date'] = pd.to_datetime(values, errors='coerce', format='mixed').notna().mean()
+        
+        field_type, confidence = 'string', 1.0 - max(shares.values())
+        for candidate, share in shares.items():
+            if share >= MIN_TYPE_SHARE:
+                field_type, confidence = candidate, share
+                break
+        
+        inferred[str(col)] = {
+            "type": field_type,
+            "confidence": round(float(confidence), 4),
+            "sampled": int(len(values))
+        }
+    
+    return inferred
+
+
+def infer_dtype_types(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Field types of a frame whose columns are already typed
+    
+    Used for self-describing formats (Parquet, Arrow), where the file
+    schema is authoritative and no sampling is needed.
+    
+    Args:
+        df: Frame read from the file
+    
+    Returns:
+        Dictionary of column -> {"type", "confidence", "sampled"}
+    """
+    inferred = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            field_type = 'boolean'
+        elif pd.api.types.is_numeric_dtype(dtype):
+            field_type = 'number'
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            field_type = 'date'
+        else:
+            field_type = 'string'
+        inferred[str(col)] = {"type": field_type, "confidence": 1.0, "sampled": len(df)}
+    return inferred
+
+
+def get_cached_types(content_hash: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Inferred types of a file seen before, by content hash"""
+    with _cache_lock:
+        inferred = _inference_cache.get(content_hash)
+        if inferred is not None:
+            _inference_cache.move_to_end(content_hash)
+        return inferred
+
+
+def cache_types(content_hash: str, inferred: Dict[str, Dict[str, Any]]) -> None:
+    """Remember the inferred types of a file"""
+    with _cache_lock:
+        _inference_cache[content_hash] = inferred
+        _inference_cache.move_to_end(content_hash)
+        while len(_inference_cache) > settings.TYPE_INFERENCE_CACHE_SIZE:
+            _inference_cache.popitem(last=False)
@@ -0,0 +1,97 @@
+"""Benchmark the bulk load strategies used by UploadService._insert_data
+
+This script creates a scratch table, loads the same synthetic DataFrame
+with every strategy available for the database dialect and prints the
+rows/s of each one. The scratch table is dropped afterwards.
+
+Usage:
+    python scripts/benchmark_bulk_load.py [rows]
+
+It uses DATABASE_URL from the environment, falling back to a temporary
+SQLite database. Set MYSQL_LOCAL_INFILE=True to include the
+LOAD DATA LOCAL INFILE strategy on MySQL.
+"""
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+
+if not os.getenv('DATABASE_URL'):
+    tmpfile = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    tmpfile.close()
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmpfile.name}"
+
+os.environ.setdefault('DEBUG', 'False')
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import MetaData, Table, Column, Integer, String, Float, DateTime, Boolean
+
+from app.database import engine, SessionLocal
+from app.services.bulk_loader import LOADERS
+from app.services.upload_service import UploadService
+
+TABLE_NAME = 'dm_bulk_load_benchmark'
+
+
+def make_frame(rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'amount': rng.random(rows) * 1000,
+        'quantity': rng.integers(0, 100, rows),
+        'region': rng.choice(['north', 'south', 'east', 'west'], rows),
+        'sold_at': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+        'returned': rng.random(rows) < 0.05,
+    })
+
+
+def create_table():
+    metadata = MetaData()
+    table = Table(
+        TABLE_NAME, metadata,
+        Column('id', Integer, primary_key=True, autoincrement=True),
+        Column('amount', Float),
+        Column('quantity', Integer),
+        Column('region', String(255)),
+        Column('sold_at', DateTime),
+        Column('returned', Boolean),
+        Column('transaction_id', String(100)),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    return metadata
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    df = make_frame(rows)
+
+    strategies = [
+        name for name in LOADERS
+        if name != 'load_data_infile' or engine.dialect.name == 'mysql'
+    ]
+
+    print(f"Dialect: {engine.dialect.name}, rows: {rows}")
+    metadata = create_table()
+    try:
+        for strategy in strategies:
+            db = SessionLocal()
+            try:
+                start = time.perf_counter()
+                UploadService._insert_data(db, TABLE_NAME, df, 'benchmark', strategy=strategy)
+                elapsed = time.perf_counter() - start
+                print(f"{strategy:>18}: {rows / elapsed:12,.0f} rows/s ({elapsed:.2f}s)")
+            except Exception as e:
+                print(f"{strategy:>18}: failed ({e})")
+                db.rollback()
+            finally:
+                db.close()
+    finally:
+        metadata.drop_all(engine)
+
+
+if __name__ == '__main__':
+    main()